@@ -0,0 +1,91 @@
+"""Unit tests for JWT payload caching in JWTAuthenticator."""
+
+import time
+from unittest.mock import patch
+
+import pytest
+
+jwt = pytest.importorskip("jwt")
+
+from {{ org_name }}.{{ solution_name }}.{{ prefix_name }}.{{ suffix_name }}.server.middleware import auth
+from {{ org_name }}.{{ solution_name }}.{{ prefix_name }}.{{ suffix_name }}.server.middleware.auth import (
+    JWTAuthenticator,
+)
+
+
+class TestJWTAuthenticatorCache:
+    """Unit tests for the JWTAuthenticator payload cache."""
+
+    @pytest.fixture
+    def authenticator(self):
+        """Create an authenticator with a test secret."""
+        return JWTAuthenticator(secret_key="test-secret")
+
+    @pytest.fixture
+    def payload(self):
+        """Create a payload that expires in a minute."""
+        return {"sub": "user-1", "roles": ["user"], "exp": time.time() + 60}
+
+    @pytest.mark.unit
+    def test_cache_hit_skips_decode(self, authenticator, payload):
+        """Test that a re-presented token is served without decoding it again."""
+        with patch.object(jwt, "decode", return_value=payload) as decode:
+            # Act
+            first = authenticator.authenticate("token")
+            second = authenticator.authenticate("token")
+
+        # Assert
+        assert first == payload
+        assert second == payload
+        decode.assert_called_once()
+
+    @pytest.mark.unit
+    def test_expired_entry_is_decoded_again(self, authenticator, payload):
+        """Test that a cached payload is not served past its exp claim."""
+        with patch.object(jwt, "decode", return_value=payload) as decode:
+            # Arrange
+            authenticator.authenticate("token")
+
+            # Act
+            with patch.object(auth.time, "time", return_value=payload["exp"] + 1):
+                authenticator.authenticate("token")
+
+        # Assert
+        assert decode.call_count == 2
+
+    @pytest.mark.unit
+    def test_returned_payload_is_isolated_from_cache(self, authenticator, payload):
+        """Test that callers modifying a payload do not change later results."""
+        with patch.object(jwt, "decode", return_value=payload):
+            # Act
+            authenticator.authenticate("token")["roles"].append("admin")
+            authenticator.authenticate("token")["roles"].append("admin")
+            result = authenticator.authenticate("token")
+
+        # Assert
+        assert result["roles"] == ["user"]
+
+    @pytest.mark.unit
+    def test_not_yet_valid_token_is_not_cached(self, authenticator, payload):
+        """Test that a token whose nbf is in the future is decoded on every call."""
+        # Arrange
+        payload["nbf"] = time.time() + 30
+
+        with patch.object(jwt, "decode", return_value=payload) as decode:
+            # Act
+            authenticator.authenticate("token")
+            authenticator.authenticate("token")
+
+        # Assert
+        assert decode.call_count == 2
+
+    @pytest.mark.unit
+    def test_token_without_exp_is_not_cached(self, authenticator):
+        """Test that a token without an exp claim is decoded on every call."""
+        with patch.object(jwt, "decode", return_value={"sub": "user-1"}) as decode:
+            # Act
+            authenticator.authenticate("token")
+            authenticator.authenticate("token")
+
+        # Assert
+        assert decode.call_count == 2
@@ -0,0 +1,128 @@
+"""Unit tests for the circuit breaker."""
+
+import json
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from {{ org_name }}.{{ solution_name }}.{{ prefix_name }}.{{ suffix_name }}.server.middleware.circuit_breaker import (
+    CircuitBreaker,
+    CircuitBreakerError,
+)
+
+
+class TestCircuitBreaker:
+    """Unit tests for CircuitBreaker state transitions."""
+
+    @pytest.fixture
+    def clock(self):
+        """Control the breaker's monotonic clock."""
+        with patch.object(CircuitBreaker, "_now", return_value=100.0) as now:
+            yield now
+
+    @pytest.fixture
+    def breaker(self, clock):
+        """Create a breaker that opens after two failures for 30 seconds."""
+        return CircuitBreaker(failure_threshold=2, timeout=30.0, name="test")
+
+    @pytest.fixture
+    def failing(self):
+        """Create a call that always fails."""
+        return AsyncMock(side_effect=ValueError("boom"))
+
+    async def open_breaker(self, breaker, failing):
+        """Fail enough calls to open the breaker."""
+        for _ in range(breaker.failure_threshold):
+            with pytest.raises(ValueError):
+                await breaker.call(failing)
+
+    @pytest.mark.unit
+    async def test_opens_after_failure_threshold(self, breaker, failing):
+        """Test that the breaker opens once failures reach the threshold."""
+        # Act
+        await self.open_breaker(breaker, failing)
+
+        # Assert
+        assert breaker.is_open
+        assert breaker.failure_count == 2
+
+    @pytest.mark.unit
+    async def test_open_breaker_rejects_without_calling(self, breaker, failing):
+        """Test that an open breaker rejects calls before running them."""
+        # Arrange
+        await self.open_breaker(breaker, failing)
+
+        # Act / Assert
+        with pytest.raises(CircuitBreakerError):
+            await breaker.call(failing)
+        assert failing.await_count == 2
+
+    @pytest.mark.unit
+    async def test_success_resets_failure_count_while_closed(self, breaker, failing):
+        """Test that a success before the threshold clears earlier failures."""
+        # Arrange
+        with pytest.raises(ValueError):
+            await breaker.call(failing)
+
+        # Act
+        await breaker.call(AsyncMock(return_value="ok"))
+
+        # Assert
+        assert breaker.is_closed
+        assert breaker.failure_count == 0
+
+    @pytest.mark.unit
+    async def test_half_open_after_timeout_then_closes(self, breaker, failing, clock):
+        """Test that the breaker probes after the timeout and closes after three successes."""
+        # Arrange
+        await self.open_breaker(breaker, failing)
+        succeeding = AsyncMock(return_value="ok")
+        clock.return_value = 130.0
+
+        # Act / Assert
+        assert await breaker.call(succeeding) == "ok"
+        assert breaker.is_half_open
+
+        await breaker.call(succeeding)
+        await breaker.call(succeeding)
+        assert breaker.is_closed
+        assert breaker.failure_count == 0
+
+    @pytest.mark.unit
+    async def test_stays_open_before_timeout(self, breaker, failing, clock):
+        """Test that the breaker keeps rejecting until the timeout has passed."""
+        # Arrange
+        await self.open_breaker(breaker, failing)
+        clock.return_value = 129.0
+
+        # Act / Assert
+        with pytest.raises(CircuitBreakerError):
+            await breaker.call(AsyncMock())
+
+    @pytest.mark.unit
+    async def test_failure_while_half_open_reopens(self, breaker, failing, clock):
+        """Test that a failed probe sends the breaker back to open."""
+        # Arrange
+        await self.open_breaker(breaker, failing)
+        clock.return_value = 130.0
+
+        # Act
+        with pytest.raises(ValueError):
+            await breaker.call(failing)
+
+        # Assert
+        assert breaker.is_open
+
+    @pytest.mark.unit
+    async def test_get_stats_returns_serializable_snapshot(self, breaker, failing):
+        """Test that stats reflect the state and are detached from the breaker."""
+        # Arrange
+        await self.open_breaker(breaker, failing)
+
+        # Act
+        stats = breaker.get_stats()
+        stats["state"] = "closed"
+
+        # Assert
+        assert json.loads(json.dumps(breaker.get_stats()))["state"] == "open"
+        assert breaker.get_stats()["failure_count"] == 2
@@ -0,0 +1,192 @@
+"""Unit tests for the gRPC metrics interceptor."""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock
+
+import grpc
+import pytest
+from prometheus_client import CollectorRegistry
+
+from {{ org_name }}.{{ solution_name }}.{{ prefix_name }}.{{ suffix_name }}.server.metrics.grpc_metrics_interceptor import (
+    UNKNOWN_METHOD,
+    GrpcMetricsInterceptor,
+)
+
+METHOD = "/example.ExampleService/GetExample"
+
+
+class NotFoundError(grpc.RpcError):
+    """RpcError carrying a NOT_FOUND status."""
+
+    def code(self):
+        return grpc.StatusCode.NOT_FOUND
+
+
+class TestGrpcMetricsInterceptor:
+    """Unit tests for GrpcMetricsInterceptor."""
+
+    @pytest.fixture
+    def registry(self):
+        """Create an isolated Prometheus registry."""
+        return CollectorRegistry()
+
+    @pytest.fixture
+    def interceptor(self, registry):
+        """Create an interceptor recording into the isolated registry."""
+        return GrpcMetricsInterceptor(registry=registry)
+
+    @pytest.fixture
+    def continuation(self):
+        """Mock the next interceptor or handler."""
+        return AsyncMock(return_value=Mock())
+
+    @pytest.mark.unit
+    async def test_records_requests_under_short_method_name(
+        self, interceptor, registry, continuation
+    ):
+        """Test that repeat calls are counted under the method name without the service path."""
+        # Act
+        await interceptor.intercept_service(continuation, Mock(method=METHOD))
+        await interceptor.intercept_service(continuation, Mock(method=METHOD))
+
+        # Assert
+        assert registry.get_sample_value(
+            "grpc_requests_total", {"method": "GetExample", "status": "OK"}
+        ) == 2.0
+        assert interceptor._get_children(METHOD) is interceptor._get_children(METHOD)
+
+    @pytest.mark.unit
+    async def test_records_duration_and_error_status(self, interceptor, registry):
+        """Test that failed calls are counted under their status and timed."""
+        # Arrange
+        continuation = AsyncMock(side_effect=NotFoundError())
+
+        # Act
+        with pytest.raises(NotFoundError):
+            await interceptor.intercept_service(continuation, Mock(method=METHOD))
+
+        # Assert
+        assert registry.get_sample_value(
+            "grpc_requests_total", {"method": "GetExample", "status": "NOT_FOUND"}
+        ) == 1.0
+        assert registry.get_sample_value(
+            "grpc_request_duration_seconds_count", {"method": "GetExample"}
+        ) == 1.0
+        assert registry.get_sample_value(
+            "grpc_request_duration_seconds_sum", {"method": "GetExample"}
+        ) >= 0
+
+    @pytest.mark.unit
+    async def test_cancelled_calls_are_not_recorded(self, interceptor, registry):
+        """Test that a cancelled call is neither counted nor timed."""
+        # Arrange
+        continuation = AsyncMock(side_effect=asyncio.CancelledError())
+
+        # Act
+        with pytest.raises(asyncio.CancelledError):
+            await interceptor.intercept_service(continuation, Mock(method=METHOD))
+
+        # Assert
+        assert registry.get_sample_value(
+            "grpc_requests_total", {"method": "GetExample", "status": "OK"}
+        ) is None
+        assert registry.get_sample_value(
+            "grpc_request_duration_seconds_count", {"method": "GetExample"}
+        ) == 0.0
+
+    @pytest.mark.unit
+    async def test_duration_uses_coarse_buckets(self, interceptor, registry, continuation):
+        """Test that durations are bucketed with the coarse default bounds."""
+        # Act
+        await interceptor.intercept_service(continuation, Mock(method=METHOD))
+
+        # Assert
+        assert registry.get_sample_value(
+            "grpc_request_duration_seconds_bucket", {"method": "GetExample", "le": "10.0"}
+        ) == 1.0
+        # Prometheus' default 0.05s bound is not one of them
+        assert registry.get_sample_value(
+            "grpc_request_duration_seconds_bucket", {"method": "GetExample", "le": "0.05"}
+        ) is None
+
+    @pytest.mark.unit
+    def test_size_histograms_have_no_method_label(self, interceptor, registry):
+        """Test that message sizes are recorded without a method label."""
+        # Act
+        interceptor.record_request_size(METHOD, 512)
+        interceptor.record_response_size(METHOD, 2048)
+
+        # Assert
+        assert registry.get_sample_value("grpc_request_size_bytes_count") == 1.0
+        assert registry.get_sample_value("grpc_response_size_bytes_sum") == 2048.0
+
+    @pytest.mark.unit
+    async def test_unregistered_methods_share_unknown_label(
+        self, interceptor, registry, continuation
+    ):
+        """Test that only registered service methods get their own label."""
+        # Arrange
+        interceptor.register_service(SimpleNamespace(
+            full_name="example.ExampleService",
+            methods=[SimpleNamespace(name="GetExample")],
+        ))
+
+        # Act
+        await interceptor.intercept_service(continuation, Mock(method=METHOD))
+        await interceptor.intercept_service(continuation, Mock(method="/x.Y/Bogus1"))
+        await interceptor.intercept_service(continuation, Mock(method="/x.Y/Bogus2"))
+
+        # Assert
+        assert registry.get_sample_value(
+            "grpc_requests_total", {"method": "GetExample", "status": "OK"}
+        ) == 1.0
+        assert registry.get_sample_value(
+            "grpc_requests_total", {"method": UNKNOWN_METHOD, "status": "OK"}
+        ) == 2.0
+
+    @pytest.mark.unit
+    async def test_max_methods_caps_labels_without_registration(self, registry, continuation):
+        """Test that only the first max_methods paths get their own label."""
+        # Arrange
+        interceptor = GrpcMetricsInterceptor(max_methods=1, registry=registry)
+
+        # Act
+        await interceptor.intercept_service(continuation, Mock(method=METHOD))
+        await interceptor.intercept_service(continuation, Mock(method="/x.Y/Bogus"))
+
+        # Assert
+        assert registry.get_sample_value(
+            "grpc_requests_total", {"method": "GetExample", "status": "OK"}
+        ) == 1.0
+        assert registry.get_sample_value(
+            "grpc_requests_total", {"method": "Bogus", "status": "OK"}
+        ) is None
+        assert registry.get_sample_value(
+            "grpc_requests_total", {"method": UNKNOWN_METHOD, "status": "OK"}
+        ) == 1.0
+
+    @pytest.mark.unit
+    async def test_active_requests_gauge_tracks_in_flight_calls(self, interceptor, registry):
+        """Test that the active gauge counts a call while it runs and drops back after."""
+        # Arrange
+        in_flight = []
+
+        async def continuation(handler_call_details):
+            in_flight.append(
+                registry.get_sample_value("grpc_requests_active", {"method": "GetExample"})
+            )
+            raise RuntimeError("boom")
+
+        # Act
+        with pytest.raises(RuntimeError):
+            await interceptor.intercept_service(continuation, Mock(method=METHOD))
+
+        # Assert
+        assert in_flight == [1.0]
+        assert registry.get_sample_value(
+            "grpc_requests_active", {"method": "GetExample"}
+        ) == 0.0
+        assert registry.get_sample_value(
+            "grpc_requests_total", {"method": "GetExample", "status": "INTERNAL"}
+        ) == 1.0
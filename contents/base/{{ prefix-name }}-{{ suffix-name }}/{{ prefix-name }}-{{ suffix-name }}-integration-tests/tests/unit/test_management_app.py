@@ -0,0 +1,97 @@
+"""Unit tests for the management HTTP endpoints."""
+
+from unittest.mock import Mock, patch
+
+import pytest
+from starlette.testclient import TestClient
+
+from {{ org_name }}.{{ solution_name }}.{{ prefix_name }}.{{ suffix_name }}.server.main import ExampleServiceServer
+
+
+class TestManagementApp:
+    """Unit tests for the management app served by ExampleServiceServer."""
+
+    @pytest.fixture
+    def server(self):
+        """Create a server that has not been started."""
+        return ExampleServiceServer()
+
+    @pytest.fixture
+    def client(self, server):
+        """Create a test client for the server's management app."""
+        return TestClient(server._create_management_app())
+
+    @pytest.mark.unit
+    def test_health_reports_unhealthy_before_startup(self, client):
+        """Test that /health reports missing dependencies as unhealthy."""
+        # Act
+        response = client.get("/health")
+
+        # Assert
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/json"
+        body = response.json()
+        assert body["status"] == "Unhealthy"
+        assert body["entries"]["database"]["status"] == "Unhealthy"
+        assert body["entries"]["grpc_server"]["status"] == "Unhealthy"
+
+    @pytest.mark.unit
+    def test_health_reports_healthy_when_running(self, server, client):
+        """Test that /health reports a running server as healthy."""
+        # Arrange
+        server.grpc_server = Mock()
+        server.db_config = Mock()
+
+        # Act
+        response = client.get("/health")
+
+        # Assert
+        body = response.json()
+        assert body["status"] == "Healthy"
+        assert body["entries"]["grpc_server"]["data"]["port"] == server.settings.grpc.port
+
+    @pytest.mark.unit
+    def test_probes_and_metrics_are_served_alongside_fastapi_routes(self, client):
+        """Test that the Starlette probe routes and the mounted FastAPI app both answer."""
+        # Act
+        live = client.get("/health/live")
+        metrics = client.get("/metrics")
+        root = client.get("/")
+
+        # Assert
+        assert live.json() == {"status": "Healthy", "description": "Application is alive"}
+        assert metrics.headers["content-type"].startswith("text/plain")
+        assert root.json()["status"] == "running"
+
+    @pytest.mark.unit
+    def test_app_is_built_once_per_server(self, server):
+        """Test that a restarted server reuses its management app."""
+        # Act
+        first = server._create_management_app()
+        second = server._create_management_app()
+
+        # Assert
+        assert first is second
+        assert ExampleServiceServer()._create_management_app() is not first
+
+    @pytest.mark.unit
+    def test_health_error_returns_500(self, server, client):
+        """Test that a failing health report is answered with a JSON 500."""
+        with patch.object(server, "_health_report", side_effect=RuntimeError("boom")):
+            # Act
+            response = client.get("/health")
+
+        # Assert
+        assert response.status_code == 500
+        assert response.json()["error"] == "boom"
+
+    @pytest.mark.unit
+    def test_readiness_error_returns_503(self, server, client):
+        """Test that a failing readiness check is answered with a JSON 503."""
+        with patch.object(server, "_readiness_issues", side_effect=RuntimeError("boom")):
+            # Act
+            response = client.get("/health/ready")
+
+        # Assert
+        assert response.status_code == 503
+        assert response.json()["status"] == "Unhealthy"
@@ -0,0 +1,200 @@
+"""Unit tests for the database migration CLI helpers."""
+
+import json
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import Mock, patch
+
+import pytest
+from click.testing import CliRunner
+
+from {{ org_name }}.{{ solution_name }}.{{ prefix_name }}.{{ suffix_name }}.server import migration
+
+
+class TestRunUpgrade:
+    """Unit tests for run_upgrade and the head check."""
+
+    @pytest.fixture(autouse=True)
+    def alembic_config(self):
+        """Avoid reading alembic.ini."""
+        with patch.object(migration, "get_alembic_config") as get_config:
+            yield get_config.return_value
+
+    @pytest.fixture
+    def upgrade(self):
+        """Mock Alembic's upgrade command."""
+        with patch("alembic.command.upgrade") as upgrade:
+            yield upgrade
+
+    @pytest.mark.unit
+    def test_skips_upgrade_when_at_head(self, upgrade):
+        """Test that a database already at head is left alone."""
+        with patch.object(migration, "is_at_head", return_value=True):
+            # Act
+            migration.run_upgrade()
+
+        # Assert
+        upgrade.assert_not_called()
+
+    @pytest.mark.unit
+    def test_upgrades_when_behind_head(self, upgrade, alembic_config):
+        """Test that a database behind head is upgraded."""
+        with patch.object(migration, "is_at_head", return_value=False):
+            # Act
+            migration.run_upgrade()
+
+        # Assert
+        upgrade.assert_called_once_with(alembic_config, "head")
+
+    @pytest.mark.unit
+    def test_force_skips_head_check(self, upgrade):
+        """Test that a forced upgrade runs without checking the head."""
+        with patch.object(migration, "is_at_head") as is_at_head:
+            # Act
+            migration.run_upgrade(force=True)
+
+        # Assert
+        is_at_head.assert_not_called()
+        upgrade.assert_called_once()
+
+    @pytest.mark.unit
+    def test_failed_head_check_still_upgrades(self, upgrade):
+        """Test that an error in the head check falls through to the upgrade."""
+        with patch.object(migration, "is_at_head", side_effect=OSError("unreachable")):
+            # Act
+            migration.run_upgrade()
+
+        # Assert
+        upgrade.assert_called_once()
+
+    @pytest.mark.unit
+    async def test_is_at_head_refuses_running_loop(self):
+        """Test that the head check raises instead of nesting event loops."""
+        with pytest.raises(RuntimeError):
+            migration.is_at_head(Mock())
+
+
+class TestUpgradeMany:
+    """Unit tests for upgrade_many."""
+
+    @pytest.fixture(autouse=True)
+    def status_file(self, tmp_path):
+        """Point the run summary at a temporary file."""
+        path = tmp_path / "migration_status.json"
+        with patch.object(migration, "_MIGRATION_STATUS_FILE", str(path)):
+            yield path
+
+    @pytest.mark.unit
+    def test_retries_failed_targets_once(self):
+        """Test that failed targets are retried once and persistent failures returned."""
+        # Arrange
+        urls = ["postgresql://db/a", "postgresql://db/b", "postgresql://db/c"]
+        attempts = []
+
+        def upgrade_target(url, force, timeouts):
+            attempts.append(url)
+            # b fails only on its first attempt; c always fails
+            if url.endswith("/c") or (url.endswith("/b") and attempts.count(url) == 1):
+                raise RuntimeError("lock timeout")
+
+        with patch.object(migration, "ProcessPoolExecutor", ThreadPoolExecutor), \
+                patch.object(migration, "_upgrade_target", upgrade_target):
+            # Act
+            failed = migration.upgrade_many(urls, jobs=2, batch_size=2)
+
+        # Assert
+        assert failed == ["postgresql://db/c"]
+        assert sorted(attempts) == sorted(urls + ["postgresql://db/b", "postgresql://db/c"])
+
+    @pytest.mark.unit
+    def test_writes_run_summary(self, status_file):
+        """Test that the shared status file gets a summary naming the failed targets."""
+        # Arrange
+        urls = ["postgresql://db/a", "postgresql://db/b"]
+
+        def upgrade_target(url, force, timeouts):
+            if url.endswith("/b"):
+                raise RuntimeError("lock timeout")
+
+        with patch.object(migration, "ProcessPoolExecutor", ThreadPoolExecutor), \
+                patch.object(migration, "_upgrade_target", upgrade_target):
+            # Act
+            migration.upgrade_many(urls, jobs=2)
+
+        # Assert
+        summary = json.loads(status_file.read_text())
+        assert summary["state"] == "failed"
+        assert summary["databases"] == 2
+        assert [entry["target"] for entry in summary["failed"]] == ["postgresql://db/b"]
+
+    @pytest.mark.unit
+    def test_targets_get_separate_status_files(self, status_file):
+        """Test that each database is given its own status file."""
+        # Act
+        first = migration._target_status_file("postgresql://db/a")
+        second = migration._target_status_file("postgresql://db/b")
+
+        # Assert
+        assert first != second
+        assert first != str(status_file)
+        assert first == migration._target_status_file("postgresql://db/a")
+
+
+class TestStatusCommand:
+    """Unit tests for the status command."""
+
+    @pytest.fixture
+    def status_file(self, tmp_path):
+        """Point the status command at a temporary file."""
+        path = tmp_path / "migration_status.json"
+        with patch.object(migration, "_MIGRATION_STATUS_FILE", str(path)):
+            yield path
+
+    @pytest.mark.unit
+    def test_prints_recorded_status(self, status_file):
+        """Test that a successful run is printed with exit code 0."""
+        # Arrange
+        status_file.write_text(json.dumps({"state": "completed", "applied": 3}))
+
+        # Act
+        result = CliRunner().invoke(migration.cli, ["status"])
+
+        # Assert
+        assert result.exit_code == 0
+        assert json.loads(result.output)["state"] == "completed"
+
+    @pytest.mark.unit
+    def test_failed_run_exits_non_zero(self, status_file):
+        """Test that a failed run is reported with exit code 1."""
+        # Arrange
+        status_file.write_text(json.dumps({"state": "failed"}))
+
+        # Act
+        result = CliRunner().invoke(migration.cli, ["status"])
+
+        # Assert
+        assert result.exit_code == 1
+
+    @pytest.mark.unit
+    def test_missing_status_file(self, status_file):
+        """Test that a missing status file is reported as an error."""
+        # Act
+        result = CliRunner().invoke(migration.cli, ["status"])
+
+        # Assert
+        assert result.exit_code == 1
+        assert "No migration status recorded" in result.output
+
+    @pytest.mark.unit
+    def test_prints_one_database_status(self, status_file):
+        """Test that --database-url reads that database's own status file."""
+        # Arrange
+        url = "postgresql://db/a"
+        with open(migration._target_status_file(url), "w", encoding="utf-8") as target_file:
+            json.dump({"state": "running", "steps": 1}, target_file)
+
+        # Act
+        result = CliRunner().invoke(migration.cli, ["status", "--database-url", url])
+
+        # Assert
+        assert result.exit_code == 0
+        assert json.loads(result.output)["state"] == "running"
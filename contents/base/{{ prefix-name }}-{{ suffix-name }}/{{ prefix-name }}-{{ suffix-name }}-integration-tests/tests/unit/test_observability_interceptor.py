@@ -0,0 +1,89 @@
+"""Unit tests for the fused observability interceptor."""
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+from structlog.contextvars import get_contextvars
+
+from {{ org_name }}.{{ solution_name }}.{{ prefix_name }}.{{ suffix_name }}.server.middleware.observability import (
+    ObservabilityInterceptor,
+)
+from {{ org_name }}.{{ solution_name }}.{{ prefix_name }}.{{ suffix_name }}.server.middleware.rate_limiting import (
+    RateLimitingInterceptor,
+)
+
+
+def make_call_details(*metadata, method="/example.ExampleService/GetExample"):
+    """Build handler call details carrying the given metadata pairs."""
+    return SimpleNamespace(method=method, invocation_metadata=tuple(metadata))
+
+
+class TestObservabilityInterceptor:
+    """Unit tests for ObservabilityInterceptor."""
+
+    @pytest.mark.unit
+    async def test_calls_continuation_once_and_returns_its_handler(self):
+        """Test that an allowed call reaches the next handler exactly once."""
+        # Arrange
+        handler = object()
+        continuation = AsyncMock(return_value=handler)
+        details = make_call_details()
+
+        # Act
+        result = await ObservabilityInterceptor().intercept_service(continuation, details)
+
+        # Assert
+        assert result is handler
+        continuation.assert_awaited_once_with(details)
+
+    @pytest.mark.unit
+    async def test_binds_incoming_correlation_id(self):
+        """Test that the caller's correlation ID is bound for logging."""
+        # Arrange
+        continuation = AsyncMock()
+        details = make_call_details(("x-correlation-id", "abc123"))
+
+        # Act
+        await ObservabilityInterceptor().intercept_service(continuation, details)
+
+        # Assert
+        assert get_contextvars()["correlation_id"] == "abc123"
+
+    @pytest.mark.unit
+    async def test_generates_correlation_id_when_missing(self):
+        """Test that a fresh correlation ID is bound for calls without one."""
+        # Arrange
+        continuation = AsyncMock()
+
+        # Act
+        await ObservabilityInterceptor().intercept_service(continuation, make_call_details())
+        first = get_contextvars()["correlation_id"]
+        await ObservabilityInterceptor().intercept_service(continuation, make_call_details())
+        second = get_contextvars()["correlation_id"]
+
+        # Assert
+        assert len(first) == 32
+        assert first != second
+
+    @pytest.mark.unit
+    async def test_rejects_calls_over_the_rate_limit(self):
+        """Test that calls beyond the burst get a rejecting handler instead of the service."""
+        # Arrange
+        rate_limiter = RateLimitingInterceptor(requests_per_second=1, burst_capacity=1)
+        interceptor = ObservabilityInterceptor(rate_limiter=rate_limiter)
+        continuation = AsyncMock(return_value=object())
+        details = make_call_details(("x-client-id", "client-1"))
+
+        try:
+            # Act
+            first = await interceptor.intercept_service(continuation, details)
+            second = await interceptor.intercept_service(continuation, details)
+
+            # Assert
+            assert first is continuation.return_value
+            assert second is not continuation.return_value
+            assert second.unary_unary is not None
+            continuation.assert_awaited_once()
+        finally:
+            await rate_limiter.close()
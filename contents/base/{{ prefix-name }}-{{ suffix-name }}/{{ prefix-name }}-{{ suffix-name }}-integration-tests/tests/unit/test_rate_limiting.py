@@ -0,0 +1,98 @@
+"""Unit tests for the rate limiting interceptor."""
+
+from unittest.mock import ANY, AsyncMock, Mock, patch
+
+import grpc
+import pytest
+
+from {{ org_name }}.{{ solution_name }}.{{ prefix_name }}.{{ suffix_name }}.server.middleware import rate_limiting
+from {{ org_name }}.{{ solution_name }}.{{ prefix_name }}.{{ suffix_name }}.server.middleware.rate_limiting import (
+    RateLimitingInterceptor,
+    TokenBucket,
+)
+
+METHOD = "/example.ExampleService/GetExample"
+
+
+class TestTokenBucket:
+    """Unit tests for TokenBucket."""
+
+    @pytest.mark.unit
+    def test_consume_until_empty_then_refill(self):
+        """Test that tokens run out at capacity and refill over time."""
+        with patch.object(rate_limiting.time, "monotonic", return_value=100.0) as clock:
+            # Arrange
+            bucket = TokenBucket(capacity=2, refill_rate=10)
+
+            # Act / Assert
+            assert bucket.consume()
+            assert bucket.consume()
+            assert not bucket.consume()
+
+            clock.return_value = 100.15
+            assert bucket.consume()
+            assert not bucket.consume()
+
+
+class TestRateLimitingInterceptor:
+    """Unit tests for RateLimitingInterceptor."""
+
+    @pytest.fixture
+    async def rate_limiter(self):
+        """Create a rate limiter allowing one request per client burst."""
+        limiter = RateLimitingInterceptor(requests_per_second=1, burst_capacity=1)
+        yield limiter
+        await limiter.close()
+
+    @pytest.mark.unit
+    async def test_allows_within_limit_and_rejects_beyond(self, rate_limiter):
+        """Test that a client gets its burst and is then rejected."""
+        # Act
+        first = await rate_limiter.check_rate_limit("client:a", METHOD)
+        second = await rate_limiter.check_rate_limit("client:a", METHOD)
+
+        # Assert
+        assert first is None
+        assert second is not None
+
+    @pytest.mark.unit
+    async def test_rejection_handler_aborts_with_resource_exhausted(self, rate_limiter):
+        """Test that the returned handler fails the call with RESOURCE_EXHAUSTED."""
+        # Arrange
+        await rate_limiter.check_rate_limit("client:a", METHOD)
+        handler = await rate_limiter.check_rate_limit("client:a", METHOD)
+        context = Mock()
+        context.abort = AsyncMock()
+
+        # Act
+        await handler.unary_unary(Mock(), context)
+
+        # Assert
+        context.abort.assert_awaited_once_with(grpc.StatusCode.RESOURCE_EXHAUSTED, ANY)
+
+    @pytest.mark.unit
+    async def test_rejection_handler_is_reused(self, rate_limiter):
+        """Test that rejections share one handler instead of building one per call."""
+        # Arrange
+        await rate_limiter.check_rate_limit("client:a", METHOD)
+
+        # Act
+        first = await rate_limiter.check_rate_limit("client:a", METHOD)
+        second = await rate_limiter.check_rate_limit("client:a", METHOD)
+
+        # Assert
+        assert first is second
+
+    @pytest.mark.unit
+    async def test_close_stops_cleanup_task(self, rate_limiter):
+        """Test that close cancels the background cleanup task."""
+        # Arrange
+        await rate_limiter.check_rate_limit("client:a", METHOD)
+        task = rate_limiter._cleanup_task
+
+        # Act
+        await rate_limiter.close()
+
+        # Assert
+        assert task.cancelled()
+        assert rate_limiter._cleanup_task is None
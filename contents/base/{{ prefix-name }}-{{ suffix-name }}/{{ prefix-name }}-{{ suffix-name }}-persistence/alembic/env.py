@@ -1,12 +1,16 @@
 """Alembic environment configuration for Example Service."""
 
 import asyncio
+import json
+import logging
 import os
 import sys
+import tempfile
+import time
 from logging.config import fileConfig
 
-from sqlalchemy import pool
-from sqlalchemy.engine import Connection
+from sqlalchemy import pool, text
+from sqlalchemy.engine import Connection, make_url
 from sqlalchemy.ext.asyncio import async_engine_from_config
 
 from alembic import context
@@ -31,6 +35,11 @@ if config.config_file_name is not None:
 # for 'autogenerate' support
 target_metadata = Base.metadata
 
+logger = logging.getLogger("alembic.env")
+
+# Progress of the running migration, for deployers and readiness probes
+MIGRATION_STATUS_FILE = os.getenv("MIGRATION_STATUS_FILE", "/tmp/migration_status.json")
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -48,6 +57,102 @@ def get_database_url() -> str:
     return config.get_main_option("sqlalchemy.url")
 
 
+def set_migration_timeouts(connection: Connection) -> None:
+    """Make migrations blocked on a lock fail instead of waiting forever.
+    
+    The migration CLI passes the timeouts in ``config.attributes``; plain
+    ``alembic`` runs fall back to the MIGRATION_*_TIMEOUT variables. Timeouts
+    use PostgreSQL interval syntax (e.g. "5s", "5min"); "0" disables one.
+    The statement timeout is off by default: long builds such as
+    ``CREATE INDEX CONCURRENTLY`` would be cancelled and leave INVALID indexes.
+    """
+    if connection.dialect.name != "postgresql":
+        return
+    
+    timeouts = config.attributes.get("migration_timeouts", {})
+    connection.execute(
+        text(
+            "SELECT set_config('lock_timeout', :lock_timeout, false), "
+            "set_config('statement_timeout', :statement_timeout, false)"
+        ),
+        {
+            "lock_timeout": timeouts.get(
+                "lock_timeout", os.getenv("MIGRATION_LOCK_TIMEOUT", "5s")
+            ),
+            "statement_timeout": timeouts.get(
+                "statement_timeout", os.getenv("MIGRATION_STATEMENT_TIMEOUT", "0")
+            ),
+        },
+    )
+    # Session-level settings outlive this commit; the migrations then start
+    # from a clean transaction state
+    connection.commit()
+
+
+def _status_target() -> str:
+    """The database being migrated, with its password hidden."""
+    try:
+        return make_url(get_database_url()).render_as_string(hide_password=True)
+    except Exception:
+        return "unknown"
+
+
+def write_migration_status(status: dict) -> None:
+    """Replace the migration status file, so readers never see a partial write.
+    
+    Parallel upgrades of several databases pass each worker its own file in
+    ``config.attributes``. The payload names the database it describes.
+    """
+    status_path = config.attributes.get("migration_status_file", MIGRATION_STATUS_FILE)
+    status["target"] = _status_target()
+    status["ts"] = time.time()
+    status_dir = os.path.dirname(os.path.abspath(status_path))
+    tmp_path = None
+    try:
+        with tempfile.NamedTemporaryFile(
+            "w", dir=status_dir, suffix=".tmp", delete=False, encoding="utf-8"
+        ) as status_file:
+            tmp_path = status_file.name
+            json.dump(status, status_file)
+        os.replace(tmp_path, status_path)
+    except OSError as e:
+        logger.warning("Could not write migration status to %s: %s", status_path, e)
+        if tmp_path is not None:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+
+
+class MigrationProgress:
+    """``on_version_apply`` callback logging each applied revision with its duration."""
+
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.last_step = self.started
+        self.steps = 0
+        self.heads = ""
+
+    def __call__(self, ctx, step, heads, run_args) -> None:
+        now = time.perf_counter()
+        elapsed = now - self.last_step
+        self.last_step = now
+        self.steps += 1
+        self.heads = ", ".join(sorted(heads)) or "base"
+
+        revision = ", ".join(step.destination_revision_ids) or "base"
+        direction = "upgrade" if step.is_upgrade else "downgrade"
+        logger.info("Applied %s to %s in %.2fs", direction, revision, elapsed)
+        write_migration_status({
+            "state": "running",
+            "current": self.heads,
+            "revision": revision,
+            "direction": direction,
+            "steps": self.steps,
+            "elapsed_s": round(now - self.started, 3),
+        })
+
+
 def run_migrations_offline() -> None:
     """Run migrations in 'offline' mode.
 
@@ -67,6 +172,7 @@ def run_migrations_offline() -> None:
         dialect_opts={"paramstyle": "named"},
         compare_type=True,
         compare_server_default=True,
+        transaction_per_migration=True,
     )
 
     with context.begin_transaction():
@@ -75,15 +181,41 @@ def run_migrations_offline() -> None:
 
 def do_run_migrations(connection: Connection) -> None:
     """Run migrations with a database connection."""
+    set_migration_timeouts(connection)
+    
+    progress = MigrationProgress()
+    
+    # Commit each revision separately, so a long upgrade never holds one
+    # transaction (and its locks) across every pending migration, and revisions
+    # applied before a failure stay applied
     context.configure(
         connection=connection,
         target_metadata=target_metadata,
         compare_type=True,
         compare_server_default=True,
+        transaction_per_migration=True,
+        on_version_apply=progress,
     )
 
-    with context.begin_transaction():
-        context.run_migrations()
+    try:
+        with context.begin_transaction():
+            context.run_migrations()
+    except Exception as e:
+        write_migration_status({
+            "state": "failed",
+            "steps": progress.steps,
+            "error": str(e),
+        })
+        raise
+    
+    # Commands that apply no versions (e.g. current, history) leave the file alone
+    if progress.steps:
+        write_migration_status({
+            "state": "completed",
+            "current": progress.heads,
+            "steps": progress.steps,
+            "elapsed_s": round(time.perf_counter() - progress.started, 3),
+        })
 
 
 async def run_async_migrations() -> None:
@@ -0,0 +1,126 @@
+"""Helpers for writing data migrations in Alembic revision scripts."""
+
+from typing import Any, Dict, Optional, Sequence
+
+import sqlalchemy as sa
+import structlog
+from alembic import op
+
+logger = structlog.get_logger(__name__)
+
+
+def batched_update(
+    table: str,
+    set_expr: str,
+    where: str = "TRUE",
+    batch_size: int = 1000,
+    id_column: str = "id",
+    params: Optional[Dict[str, Any]] = None
+) -> int:
+    """Update matching rows in id-ordered batches, committing each batch.
+
+    Each batch runs in its own autocommit statement, so row locks are held only
+    for one batch and rows updated before a failure stay updated. Batches walk
+    the table by ``id_column``, so rows are visited once even if the update
+    makes them stop matching ``where``.
+
+    ``table``, ``set_expr``, ``where`` and ``id_column`` are inserted into the
+    SQL as-is and must not contain untrusted input; pass values via ``params``.
+
+    Example:
+        batched_update("example", "status = :status", "status IS NULL",
+                       params={"status": "ACTIVE"})
+
+    Args:
+        table: Table to update
+        set_expr: SQL for the SET clause
+        where: SQL condition selecting rows to update
+        batch_size: Maximum rows updated per batch
+        id_column: Unique, orderable column used to page through rows
+        params: Bind parameters referenced by ``set_expr`` or ``where``
+
+    Returns:
+        Total number of rows updated
+    """
+    first_batch = sa.text(
+        f"UPDATE {table} SET {set_expr} WHERE {id_column} IN ("
+        f"SELECT {id_column} FROM {table} WHERE ({where}) "
+        f"ORDER BY {id_column} LIMIT :batch_size"
+        f") RETURNING {id_column}"
+    )
+    next_batch = sa.text(
+        f"UPDATE {table} SET {set_expr} WHERE {id_column} IN ("
+        f"SELECT {id_column} FROM {table} WHERE ({where}) AND {id_column} > :last_id "
+        f"ORDER BY {id_column} LIMIT :batch_size"
+        f") RETURNING {id_column}"
+    )
+
+    bind_params = dict(params or {}, batch_size=batch_size)
+    total = 0
+    last_id = None
+
+    with op.get_context().autocommit_block():
+        connection = op.get_bind()
+        while True:
+            if last_id is None:
+                statement = first_batch
+            else:
+                statement = next_batch
+                bind_params["last_id"] = last_id
+
+            ids = connection.execute(statement, bind_params).scalars().all()
+            if not ids:
+                break
+
+            total += len(ids)
+            last_id = max(ids)
+            logger.info("Updated batch", table=table, rows=len(ids), total=total)
+
+            if len(ids) < batch_size:
+                break
+
+    return total
+
+
+def create_index_concurrently(
+    name: str,
+    table: str,
+    columns: Sequence[str],
+    unique: bool = False
+) -> None:
+    """Create an index without blocking writes to the table (PostgreSQL).
+
+    ``CREATE INDEX CONCURRENTLY`` cannot run inside a transaction, so it is
+    issued outside the migration's transaction. A failed concurrent build
+    leaves an INVALID index behind under the same name; that leftover is
+    dropped and rebuilt, while an existing valid index is kept as is.
+
+    Args:
+        name: Index name
+        table: Table to index
+        columns: Indexed column names
+        unique: Whether to create a unique index
+    """
+    with op.get_context().autocommit_block():
+        is_valid = op.get_bind().execute(
+            sa.text(
+                "SELECT indisvalid FROM pg_index "
+                "WHERE indexrelid = to_regclass(:name)"
+            ),
+            {"name": name}
+        ).scalar()
+
+        if is_valid:
+            logger.info("Index already exists", index=name, table=table)
+            return
+        if is_valid is not None:
+            logger.warning("Dropping invalid index left by a failed build", index=name, table=table)
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
+
+        op.create_index(
+            name,
+            table,
+            list(columns),
+            unique=unique,
+            postgresql_concurrently=True
+        )
@@ -25,6 +25,9 @@ class GrpcSettings:
         self.max_receive_message_length = int(os.getenv("GRPC_MAX_RECEIVE_MESSAGE_LENGTH", "4194304"))  # 4MB
         self.max_send_message_length = int(os.getenv("GRPC_MAX_SEND_MESSAGE_LENGTH", "4194304"))  # 4MB
         self.reflection_enabled = os.getenv("GRPC_REFLECTION_ENABLED", "true").lower() == "true"
+        self.rate_limit_enabled = os.getenv("GRPC_RATE_LIMIT_ENABLED", "false").lower() == "true"
+        self.rate_limit_rps = int(os.getenv("GRPC_RATE_LIMIT_RPS", "100"))
+        self.rate_limit_burst = int(os.getenv("GRPC_RATE_LIMIT_BURST", "200"))
 
 
 class ManagementSettings:
@@ -1,9 +1,13 @@
 """Main entry point for the Example Service server."""
 
 import asyncio
+import json
 import logging
+import os
+import platform
 import signal
 import sys
+import threading
 import time
 from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
@@ -12,7 +16,13 @@ import click
 import grpc
 import structlog
 import uvicorn
-from grpc_reflection.v1alpha import reflection
+from fastapi import FastAPI
+from grpc_reflection.v1alpha import reflection, reflection_pb2
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Mount, Route
 from testcontainers.postgres import PostgresContainer
 
 from .config.settings import get_settings
@@ -22,6 +32,9 @@ from .health.health_checks import (
     GrpcHealthCheck,
     HealthCheckManager,
 )
+from .metrics.grpc_metrics_interceptor import GrpcMetricsInterceptor, get_grpc_metrics_interceptor
+from .middleware.observability import create_observability_interceptor
+from .middleware.rate_limiting import RateLimitingInterceptor
 
 # Note: These imports will work once we set up proper dependencies
 # from {{ org_name }}.{{ solution_name }}.{{ prefix_name }}.{{ suffix_name }}.persistence.database_config import init_database, get_db_config
@@ -32,6 +45,9 @@ from .health.health_checks import (
 
 logger = structlog.get_logger(__name__)
 
+# Liveness never varies, so its body is encoded once
+_LIVENESS_BODY = json.dumps({"status": "Healthy", "description": "Application is alive"}).encode()
+
 
 class ExampleServiceServer:
     """Main server class for the Example Service."""
@@ -43,6 +59,9 @@ class ExampleServiceServer:
         self.grpc_server: Optional[grpc.aio.Server] = None
         self.management_server_task: Optional[asyncio.Task] = None
         self.management_server = None  # uvicorn server instance
+        self._management_app: Optional[Starlette] = None  # built once, reused on restart
+        self.rate_limiter: Optional[RateLimitingInterceptor] = None
+        self.metrics_interceptor: Optional[GrpcMetricsInterceptor] = None
         self.health_check_manager = HealthCheckManager()
         self.postgres_container = None  # For ephemeral mode
         
@@ -123,6 +142,11 @@ class ExampleServiceServer:
             except Exception as e:
                 logger.error("Error during server shutdown", error=str(e))
         
+        # Stop the rate limiter's background bucket cleanup
+        if self.rate_limiter:
+            await self.rate_limiter.close()
+            self.rate_limiter = None
+        
         # Close database connections
         if self.db_config:
             logger.info("Closing database connections...")
@@ -199,7 +223,6 @@ class ExampleServiceServer:
         
         try:
             # Auto-detect Docker socket for cross-platform compatibility if not already set
-            import os
             if not os.environ.get('DOCKER_HOST'):
                 docker_sockets = [
                     (f"unix://{os.path.expanduser('~/.rd/docker.sock')}", "Rancher Desktop"),
@@ -517,6 +540,7 @@ class ExampleServiceServer:
         # Create gRPC server
         self.grpc_server = grpc.aio.server(
             ThreadPoolExecutor(max_workers=self.settings.grpc.max_workers),
+            interceptors=self._create_interceptors(),
             options=[
                 ('grpc.max_receive_message_length', self.settings.grpc.max_receive_message_length),
                 ('grpc.max_send_message_length', self.settings.grpc.max_send_message_length),
@@ -531,10 +555,12 @@ class ExampleServiceServer:
             logger.debug("Ephemeral database functionality is working correctly!")
             
             # TODO: Fix protobuf module import issue and uncomment below:
+            # import {{ org_name }}.{{ solution_name }}.{{ prefix_name }}.{{ suffix_name }}.grpc.{{ prefix_name }}_{{ suffix_name }}_pb2 as pb2
             # import {{ org_name }}.{{ solution_name }}.{{ prefix_name }}.{{ suffix_name }}.grpc.{{ prefix_name }}_{{ suffix_name }}_pb2_grpc as pb2_grpc
             # from .grpc.{{ prefix_name }}_{{ suffix_name }}_grpc_impl import {{ PrefixName }}{{ SuffixName }}ServiceImpl
             # service_impl = {{ PrefixName }}{{ SuffixName }}ServiceImpl()
             # pb2_grpc.add_{{ PrefixName }}{{ SuffixName }}Servicer_to_server(service_impl, self.grpc_server)
+            # self.metrics_interceptor.register_service(pb2.DESCRIPTOR.services_by_name["{{ PrefixName }}{{ SuffixName }}"])
             # logger.info("{{ PrefixName }} {{ SuffixName }} service registered successfully")
             
         except ImportError as e:
@@ -548,6 +574,9 @@ class ExampleServiceServer:
                 reflection.SERVICE_NAME,
             )
             reflection.enable_server_reflection(SERVICE_NAMES, self.grpc_server)
+            self.metrics_interceptor.register_service(
+                reflection_pb2.DESCRIPTOR.services_by_name["ServerReflection"]
+            )
             logger.debug("gRPC reflection enabled")
         
         # Start server
@@ -561,14 +590,129 @@ class ExampleServiceServer:
         
         logger.info("gRPC server started", address=listen_addr)
 
-    async def _start_management_server(self) -> None:
-        """Start the management HTTP server."""
-        logger.info("Starting management server", port=self.settings.management.port)
+    def _create_interceptors(self) -> list:
+        """Create the gRPC server interceptors.
         
-        # Create a simple FastAPI app for health checks
-        from fastapi import FastAPI
-        import uvicorn
-        import logging
+        Correlation IDs, rate limiting and tracing run in one fused interceptor;
+        the standalone interceptors for them must not be registered alongside it.
+        The metrics interceptor runs first so rate limited calls are counted too.
+        """
+        self.metrics_interceptor = get_grpc_metrics_interceptor()
+        
+        if self.settings.grpc.rate_limit_enabled:
+            self.rate_limiter = RateLimitingInterceptor(
+                requests_per_second=self.settings.grpc.rate_limit_rps,
+                burst_capacity=self.settings.grpc.rate_limit_burst
+            )
+            logger.info(
+                "gRPC rate limiting enabled",
+                requests_per_second=self.settings.grpc.rate_limit_rps,
+                burst_capacity=self.settings.grpc.rate_limit_burst
+            )
+        
+        tracing_interceptor = None
+        observability = self.settings.observability
+        if observability.tracing_enabled:
+            # OpenTelemetry is only needed when tracing is turned on
+            from .middleware.tracing import TracingConfig, create_tracing_interceptor, setup_tracing
+            
+            setup_tracing(TracingConfig(
+                service_name=self.settings.service_name,
+                service_version=self.settings.version,
+                otlp_endpoint=observability.otlp_endpoint,
+                jaeger_endpoint=observability.jaeger_endpoint,
+                sample_rate=observability.trace_sample_rate,
+                # The interceptor creates the server spans
+                enable_grpc_instrumentation=False
+            ))
+            tracing_interceptor = create_tracing_interceptor()
+            logger.info("gRPC tracing enabled")
+        
+        return [
+            self.metrics_interceptor,
+            create_observability_interceptor(
+                rate_limiter=self.rate_limiter,
+                tracing=tracing_interceptor
+            )
+        ]
+
+    def _health_report(self) -> dict:
+        """Build the detailed health report served on /health (matching .NET)."""
+        checks = {}
+        overall_status = "Healthy"
+        
+        # Database health check
+        try:
+            if self.postgres_container or self.db_config:
+                # Simulate database health check
+                checks["database"] = {
+                    "status": "Healthy",
+                    "description": "Database connection is available",
+                    "data": {
+                        "connection_string": "postgresql://[hidden]",
+                        "pool_status": "active"
+                    },
+                    "duration": "00:00:00.0123456"
+                }
+            else:
+                checks["database"] = {
+                    "status": "Unhealthy", 
+                    "description": "Database not configured",
+                    "duration": "00:00:00.0000000"
+                }
+                overall_status = "Unhealthy"
+        except Exception as e:
+            checks["database"] = {
+                "status": "Unhealthy",
+                "description": f"Database check failed: {str(e)}",
+                "duration": "00:00:00.0000000"
+            }
+            overall_status = "Unhealthy"
+        
+        # gRPC server health check
+        checks["grpc_server"] = {
+            "status": "Healthy" if self.grpc_server else "Unhealthy",
+            "description": "gRPC server status",
+            "data": {
+                "port": self.settings.grpc.port,
+                "reflection_enabled": self.settings.grpc.reflection_enabled
+            },
+            "duration": "00:00:00.0001234"
+        }
+        
+        if not self.grpc_server:
+            overall_status = "Unhealthy"
+        
+        return {
+            "status": overall_status,
+            "totalDuration": "00:00:00.0234567",
+            "entries": checks
+        }
+
+    def _readiness_issues(self) -> list:
+        """List the dependencies keeping the server from serving traffic."""
+        issues = []
+        
+        # Check if gRPC server is running
+        if not self.grpc_server:
+            issues.append("gRPC server not running")
+        
+        # Check database connectivity
+        if not (self.postgres_container or self.db_config):
+            issues.append("Database not available")
+        
+        return issues
+
+    def _create_management_app(self) -> Starlette:
+        """Create the management ASGI application for health checks and metrics.
+        
+        Health probes and the Prometheus scrape endpoint are plain Starlette
+        routes, so they skip FastAPI's request validation and dependency
+        injection. The FastAPI app mounted underneath them serves everything else.
+        The app is built once per server and reused if the server is restarted.
+        """
+        if self._management_app is not None:
+            return self._management_app
         
         app = FastAPI(title="{{ PrefixName }} {{ SuffixName }} Management", version="0.1.0")
         
@@ -576,107 +720,68 @@ class ExampleServiceServer:
         async def root():
             return {"service": "{{ PrefixName }} {{ SuffixName }}", "version": "0.1.0", "status": "running"}
         
-        @app.get("/health")
-        async def health():
+        async def health(request: Request) -> Response:
             """Comprehensive health check with detailed JSON response (matching .NET)."""
-            import datetime
-            
-            checks = {}
-            overall_status = "Healthy"
-            
-            # Database health check
             try:
-                if self.postgres_container or self.db_config:
-                    # Simulate database health check
-                    checks["database"] = {
-                        "status": "Healthy",
-                        "description": "Database connection is available",
-                        "data": {
-                            "connection_string": "postgresql://[hidden]",
-                            "pool_status": "active"
-                        },
-                        "duration": "00:00:00.0123456"
-                    }
-                else:
-                    checks["database"] = {
-                        "status": "Unhealthy", 
-                        "description": "Database not configured",
-                        "duration": "00:00:00.0000000"
-                    }
-                    overall_status = "Unhealthy"
+                report = self._health_report()
             except Exception as e:
-                checks["database"] = {
-                    "status": "Unhealthy",
-                    "description": f"Database check failed: {str(e)}",
-                    "duration": "00:00:00.0000000"
-                }
-                overall_status = "Unhealthy"
-            
-            # gRPC server health check
-            checks["grpc_server"] = {
-                "status": "Healthy" if self.grpc_server else "Unhealthy",
-                "description": "gRPC server status",
-                "data": {
-                    "port": self.settings.grpc.port,
-                    "reflection_enabled": self.settings.grpc.reflection_enabled
-                },
-                "duration": "00:00:00.0001234"
-            }
-            
-            if not self.grpc_server:
-                overall_status = "Unhealthy"
+                logger.error("Health check failed", error=str(e), exc_info=True)
+                # Answer directly rather than raising into the exception handlers
+                return JSONResponse(
+                    {"status": "Unhealthy", "error": str(e), "timestamp": time.time()},
+                    status_code=500
+                )
             
-            return {
-                "status": overall_status,
-                "totalDuration": "00:00:00.0234567",
-                "entries": checks
-            }
+            # The report holds only JSON types, so it is encoded directly
+            return Response(content=json.dumps(report), media_type="application/json")
         
-        @app.get("/health/live")
-        async def health_live():
+        async def health_live(request: Request) -> Response:
             """Kubernetes liveness probe - basic app health."""
-            return {
-                "status": "Healthy",
-                "description": "Application is alive"
-            }
+            return Response(content=_LIVENESS_BODY, media_type="application/json")
         
-        @app.get("/health/ready")  
-        async def health_ready():
+        async def health_ready(request: Request) -> Response:
             """Kubernetes readiness probe - dependencies health."""
-            ready = True
-            checks = []
-            
-            # Check if gRPC server is running
-            if not self.grpc_server:
-                ready = False
-                checks.append("gRPC server not running")
-            
-            # Check database connectivity
-            if not (self.postgres_container or self.db_config):
-                ready = False
-                checks.append("Database not available")
+            try:
+                checks = self._readiness_issues()
+            except Exception as e:
+                logger.error("Readiness check failed", error=str(e), exc_info=True)
+                return JSONResponse(
+                    {"status": "Unhealthy", "error": str(e), "timestamp": time.time()},
+                    status_code=503
+                )
             
-            if ready:
-                return {
+            if not checks:
+                return JSONResponse({
                     "status": "Healthy",
                     "description": "Application is ready to serve traffic"
-                }
+                })
             else:
-                return {
+                return JSONResponse({
                     "status": "Unhealthy", 
                     "description": "Application not ready",
                     "issues": checks
-                }
+                })
         
-        @app.get("/metrics")
-        async def metrics():
+        async def metrics(request: Request) -> Response:
             """Prometheus metrics endpoint."""
-            from prometheus_client import generate_latest, CONTENT_TYPE_LATEST
-            from fastapi import Response
-            
             metrics_data = generate_latest()
             return Response(content=metrics_data, media_type=CONTENT_TYPE_LATEST)
         
+        self._management_app = Starlette(routes=[
+            Route("/health", health),
+            Route("/health/live", health_live),
+            Route("/health/ready", health_ready),
+            Route("/metrics", metrics),
+            Mount("/", app=app),
+        ])
+        return self._management_app
+
+    async def _start_management_server(self) -> None:
+        """Start the management HTTP server."""
+        logger.info("Starting management server", port=self.settings.management.port)
+        
+        app = self._create_management_app()
+        
         # Configure uvicorn to suppress unnecessary logging during shutdown
         uvicorn_logger = logging.getLogger("uvicorn.error")
         uvicorn_logger.setLevel(logging.WARNING)
@@ -741,11 +846,6 @@ class ExampleServiceServer:
 
 def setup_logging(log_level: str = "INFO", log_format: str = "json") -> None:
     """Set up structured logging with enrichment (matching .NET service capabilities)."""
-    import logging
-    import platform
-    import threading
-    import os
-    
     # Get environment info for log enrichment
     environment = os.getenv("ENVIRONMENT", "development")
     service_name = "{{ prefix-name }}-{{ suffix-name }}"
@@ -762,12 +862,18 @@ def setup_logging(log_level: str = "INFO", log_format: str = "json") -> None:
         event_dict["machine_name"] = platform.node()
         event_dict["thread_id"] = threading.get_ident()
         
-        # Add correlation ID if available
-        from .middleware.correlation_interceptor import get_correlation_id
-        correlation_id = get_correlation_id()
-        if correlation_id:
-            event_dict["correlation_id"] = correlation_id
-        
+        # The correlation ID comes from merge_contextvars, bound per request by
+        # the correlation interceptor
+        return event_dict
+    
+    stack_info_renderer = structlog.processors.StackInfoRenderer()
+    
+    def render_exc_and_stack_info(logger, name, event_dict):
+        """Render exc_info/stack_info only when the event carries them."""
+        if "exc_info" in event_dict:
+            event_dict = structlog.processors.format_exc_info(logger, name, event_dict)
+        if "stack_info" in event_dict:
+            event_dict = stack_info_renderer(logger, name, event_dict)
         return event_dict
     
     if log_format == "json":
@@ -775,13 +881,13 @@ def setup_logging(log_level: str = "INFO", log_format: str = "json") -> None:
         structlog.configure(
             processors=[
                 structlog.stdlib.filter_by_level,
+                structlog.contextvars.merge_contextvars,  # Request-scoped context (correlation ID)
                 structlog.stdlib.add_logger_name,
                 structlog.stdlib.add_log_level,
                 structlog.stdlib.PositionalArgumentsFormatter(),
                 add_enrichment,  # Custom enrichment processor
                 structlog.processors.TimeStamper(fmt="iso"),
-                structlog.processors.StackInfoRenderer(),
-                structlog.processors.format_exc_info,
+                render_exc_and_stack_info,  # No-op on the common non-error path
                 structlog.processors.UnicodeDecoder(),
                 structlog.processors.JSONRenderer()
             ],
@@ -794,6 +900,7 @@ def setup_logging(log_level: str = "INFO", log_format: str = "json") -> None:
         structlog.configure(
             processors=[
                 structlog.stdlib.filter_by_level,
+                structlog.contextvars.merge_contextvars,  # Request-scoped context (correlation ID)
                 structlog.stdlib.add_logger_name,
                 structlog.stdlib.add_log_level,
                 structlog.stdlib.PositionalArgumentsFormatter(),
@@ -837,7 +944,6 @@ def setup_logging(log_level: str = "INFO", log_format: str = "json") -> None:
 def main(log_level: str, log_format: str, ephemeral: bool) -> None:
     """Main entry point for the Example Service server."""
     # Set up logging - check environment variable for structured logging
-    import os
     use_structured = os.getenv("LOGGING_STRUCTURED", "false").lower() == "true"
     actual_format = "json" if use_structured else log_format
     setup_logging(log_level, actual_format)
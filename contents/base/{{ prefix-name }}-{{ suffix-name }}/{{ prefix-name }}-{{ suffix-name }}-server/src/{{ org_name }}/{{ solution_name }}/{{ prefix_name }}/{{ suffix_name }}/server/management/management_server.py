@@ -1,5 +1,7 @@
 """Management HTTP server for health checks, metrics, and administration."""
 
+import logging
+import time
 from typing import Dict, Any
 
 from fastapi import FastAPI, HTTPException, Response
@@ -225,7 +227,6 @@ def create_management_app(
             )
         
         # Update logging level
-        import logging
         logging.getLogger().setLevel(level)
         
         logger.info("Log level changed", new_level=level)
@@ -277,7 +278,3 @@ async def _update_dynamic_metrics() -> None:
         
     except Exception as e:
         logger.warning("Failed to update dynamic metrics", error=str(e))
-
-
-# Import time for timestamps
-import time
\ No newline at end of file
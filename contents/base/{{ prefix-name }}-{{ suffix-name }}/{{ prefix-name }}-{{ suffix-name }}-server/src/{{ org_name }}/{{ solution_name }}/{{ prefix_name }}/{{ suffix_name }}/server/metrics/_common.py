@@ -0,0 +1,56 @@
+"""Helpers shared by the metrics modules."""
+
+import logging
+import os
+from typing import Any, Optional
+
+import structlog
+
+
+def _metrics_log_level() -> int:
+    """Level for metrics loggers: ``METRICS_LOG_LEVEL``, else the root logger's level."""
+    level_name = os.getenv("METRICS_LOG_LEVEL")
+    if level_name:
+        return getattr(logging, level_name.upper(), logging.INFO)
+    return logging.getLogger().getEffectiveLevel()
+
+
+class _MetricsLogger:
+    """Filtering logger whose level is resolved on first use.
+
+    Metrics modules create their loggers at import time, before logging is
+    configured, so the level is read once the first message is logged.
+    """
+
+    def __init__(self, name: str) -> None:
+        self._name = name
+        self._logger: Optional[Any] = None
+
+    def __getattr__(self, attr: str) -> Any:
+        if self._logger is None:
+            self._logger = structlog.wrap_logger(
+                logging.getLogger(self._name),
+                wrapper_class=structlog.make_filtering_bound_logger(_metrics_log_level()),
+            )
+        value = getattr(self._logger, attr)
+        # Later calls find the method on the instance and skip __getattr__
+        setattr(self, attr, value)
+        return value
+
+
+def metrics_logger(name: str) -> Any:
+    """Create a logger for metric hot paths.
+
+    Calls below ``METRICS_LOG_LEVEL`` (default: the configured root level)
+    return immediately, before any event dict is built or the processor chain runs.
+    """
+    return _MetricsLogger(name)
+
+
+def parse_buckets(env_var: str, default: str) -> tuple[float, ...]:
+    """Parse a comma-separated list of histogram bucket bounds from the environment."""
+    return tuple(float(bound) for bound in os.getenv(env_var, default).split(","))
+
+
+# Every bucket is a separate series per label set, so keep these coarse
+LATENCY_BUCKETS = parse_buckets("GRPC_LATENCY_BUCKETS", "0.005,0.025,0.1,0.5,2.5,10")
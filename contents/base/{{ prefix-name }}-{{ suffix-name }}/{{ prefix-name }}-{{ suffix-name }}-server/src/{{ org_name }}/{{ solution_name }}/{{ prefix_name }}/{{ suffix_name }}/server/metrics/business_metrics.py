@@ -1,12 +1,14 @@
 """Business metrics collection for {{ PrefixName }} {{ SuffixName }} Service."""
 
+import functools
 import time
-from typing import Dict, Optional
+from typing import Any, Dict, Tuple
 
 from prometheus_client import Counter, Histogram, Gauge, Info
-import structlog
 
-logger = structlog.get_logger(__name__)
+from ._common import LATENCY_BUCKETS, metrics_logger
+
+logger = metrics_logger(__name__)
 
 
 class BusinessMetrics:
@@ -27,7 +29,7 @@ class BusinessMetrics:
             '{{ prefix_name }}_{{ suffix_name }}_operation_duration_seconds',
             'Duration of project prefix operations in seconds',
             ['operation'],
-            buckets=[0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0]
+            buckets=LATENCY_BUCKETS
         )
         
         # Active project prefixes gauge
@@ -47,7 +49,7 @@ class BusinessMetrics:
             '{{ prefix_name }}_{{ suffix_name }}_database_operation_duration_seconds',
             'Duration of database operations in seconds',
             ['operation', 'table'],
-            buckets=[0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0]
+            buckets=LATENCY_BUCKETS
         )
         
         # Connection pool metrics
@@ -112,6 +114,33 @@ class BusinessMetrics:
             'service': '{{ prefix-name }}-{{ suffix-name }}',
             'environment': 'development'
         })
+        
+        # Shadow copies of the gauge values for get_metrics_summary, so the
+        # summary never reads prometheus_client internals (which do not exist
+        # in multiprocess mode)
+        self._gauge_values: Dict[str, float] = {
+            'active_examples': 0,
+            'database_connections_active': 0,
+            'database_connections_idle': 0,
+        }
+        
+        # Label-bound database metric children keyed by (operation, table)
+        self._db_children: Dict[Tuple[str, str], Tuple[Any, Dict[str, Any]]] = {}
+
+    def _db(self, operation: str, table: str) -> Tuple[Any, Dict[str, Any]]:
+        """Return the duration child and status-keyed counter children for a table operation."""
+        key = (operation, table)
+        children = self._db_children.get(key)
+        if children is None:
+            children = (
+                self.database_operation_duration_seconds.labels(operation, table),
+                {
+                    status: self.database_operations_total.labels(operation, table, status)
+                    for status in ('success', 'error')
+                }
+            )
+            self._db_children[key] = children
+        return children
 
     def record_operation_start(self, operation: str) -> float:
         """Record the start of an operation.
@@ -120,10 +149,10 @@ class BusinessMetrics:
             operation: The operation name
             
         Returns:
-            Start time for duration calculation
+            Monotonic start time for duration calculation
         """
         logger.debug("Recording operation start", operation=operation)
-        return time.time()
+        return time.monotonic()
 
     def record_operation_success(self, operation: str, start_time: float) -> None:
         """Record a successful operation.
@@ -132,7 +161,7 @@ class BusinessMetrics:
             operation: The operation name
             start_time: When the operation started
         """
-        duration = time.time() - start_time
+        duration = time.monotonic() - start_time
         
         self.example_operations_total.labels(
             operation=operation,
@@ -157,7 +186,7 @@ class BusinessMetrics:
             start_time: When the operation started
             error_code: The error code
         """
-        duration = time.time() - start_time
+        duration = time.monotonic() - start_time
         
         self.example_operations_total.labels(
             operation=operation,
@@ -188,14 +217,14 @@ class BusinessMetrics:
             table: The table name
             
         Returns:
-            Start time for duration calculation
+            Monotonic start time for duration calculation
         """
         logger.debug(
             "Recording database operation start",
             operation=operation,
             table=table
         )
-        return time.time()
+        return time.monotonic()
 
     def record_database_operation_success(
         self, 
@@ -210,18 +239,11 @@ class BusinessMetrics:
             table: The table name
             start_time: When the operation started
         """
-        duration = time.time() - start_time
-        
-        self.database_operations_total.labels(
-            operation=operation,
-            table=table,
-            status='success'
-        ).inc()
+        duration = time.monotonic() - start_time
         
-        self.database_operation_duration_seconds.labels(
-            operation=operation,
-            table=table
-        ).observe(duration)
+        duration_child, status_counters = self._db(operation, table)
+        status_counters['success'].inc()
+        duration_child.observe(duration)
         
         logger.debug(
             "Recorded successful database operation",
@@ -243,18 +265,11 @@ class BusinessMetrics:
             table: The table name
             start_time: When the operation started
         """
-        duration = time.time() - start_time
-        
-        self.database_operations_total.labels(
-            operation=operation,
-            table=table,
-            status='error'
-        ).inc()
+        duration = time.monotonic() - start_time
         
-        self.database_operation_duration_seconds.labels(
-            operation=operation,
-            table=table
-        ).observe(duration)
+        duration_child, status_counters = self._db(operation, table)
+        status_counters['error'].inc()
+        duration_child.observe(duration)
         
         logger.debug(
             "Recorded failed database operation",
@@ -269,6 +284,7 @@ class BusinessMetrics:
         Args:
             count: Number of active examples
         """
+        self._gauge_values['active_examples'] = count
         self.active_examples_total.set(count)
         logger.debug("Updated active examples count", count=count)
 
@@ -279,6 +295,8 @@ class BusinessMetrics:
             active: Number of active connections
             idle: Number of idle connections
         """
+        self._gauge_values['database_connections_active'] = active
+        self._gauge_values['database_connections_idle'] = idle
         self.database_connections_active.set(active)
         self.database_connections_idle.set(idle)
         
@@ -294,27 +312,17 @@ class BusinessMetrics:
         Returns:
             Dictionary of metric names and values
         """
-        return {
-            'active_examples': self.active_examples_total._value._value,
-            'database_connections_active': self.database_connections_active._value._value,
-            'database_connections_idle': self.database_connections_idle._value._value,
-        }
-
-
-# Global metrics instance
-business_metrics: Optional[BusinessMetrics] = None
+        return dict(self._gauge_values)
 
 
+@functools.cache
 def get_business_metrics() -> BusinessMetrics:
     """Get the global business metrics instance.
     
     Returns:
         Business metrics instance
     """
-    global business_metrics
-    if business_metrics is None:
-        business_metrics = BusinessMetrics()
-    return business_metrics
+    return BusinessMetrics()
 
 
 def init_business_metrics() -> BusinessMetrics:
@@ -323,7 +331,7 @@ def init_business_metrics() -> BusinessMetrics:
     Returns:
         Initialized business metrics instance
     """
-    global business_metrics
-    business_metrics = BusinessMetrics()
+    get_business_metrics.cache_clear()
+    business_metrics = get_business_metrics()
     logger.info("Business metrics initialized")
     return business_metrics
\ No newline at end of file
@@ -1,26 +1,48 @@
 """gRPC metrics interceptor for collecting request metrics."""
 
+import functools
 import time
-from typing import Any, Callable, Optional
+from typing import Any, Callable, Dict, NamedTuple, Optional, Set
 
 import grpc
-from prometheus_client import Counter, Histogram, Gauge
-import structlog
+from prometheus_client import REGISTRY, CollectorRegistry, Counter, Histogram, Gauge
 
-logger = structlog.get_logger(__name__)
+from ._common import LATENCY_BUCKETS, metrics_logger, parse_buckets
+
+logger = metrics_logger(__name__)
+
+SIZE_BUCKETS = parse_buckets("GRPC_SIZE_BUCKETS", "256,4096,65536,1048576,4194304")
+
+# Label value used for method paths that are not allowed their own series
+UNKNOWN_METHOD = "unknown"
+
+
+class _MethodMetrics(NamedTuple):
+    """Label-bound metric children for a single gRPC method."""
+    name: str
+    requests_total: Dict[str, Any]  # status -> Counter child, filled on first use
+    request_duration: Any
+    requests_active: Any
 
 
 class GrpcMetricsInterceptor(grpc.aio.ServerInterceptor):
     """gRPC server interceptor for collecting metrics."""
 
-    def __init__(self) -> None:
-        """Initialize the gRPC metrics interceptor."""
+    def __init__(self, max_methods: int = 256, registry: CollectorRegistry = REGISTRY) -> None:
+        """Initialize the gRPC metrics interceptor.
+        
+        Args:
+            max_methods: Maximum number of distinct method paths given their own
+                label value when no methods have been registered
+            registry: Prometheus registry the metrics are registered with
+        """
         
         # Request counters
         self.grpc_requests_total = Counter(
             'grpc_requests_total',
             'Total number of gRPC requests',
-            ['method', 'status']
+            ['method', 'status'],
+            registry=registry
         )
         
         # Request duration histogram
@@ -28,34 +50,114 @@ class GrpcMetricsInterceptor(grpc.aio.ServerInterceptor):
             'grpc_request_duration_seconds',
             'Duration of gRPC requests in seconds',
             ['method'],
-            buckets=[0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0]
+            buckets=LATENCY_BUCKETS,
+            registry=registry
         )
         
-        # Request size histogram
+        # Request/response size histograms are deliberately not labelled by
+        # method: per-method size distributions rarely drive alerts but multiply
+        # the series count by (#methods x #buckets)
         self.grpc_request_size_bytes = Histogram(
             'grpc_request_size_bytes',
             'Size of gRPC request messages in bytes',
-            ['method'],
-            buckets=[64, 256, 1024, 4096, 16384, 65536, 262144, 1048576]
+            buckets=SIZE_BUCKETS,
+            registry=registry
         )
         
-        # Response size histogram
         self.grpc_response_size_bytes = Histogram(
             'grpc_response_size_bytes',
             'Size of gRPC response messages in bytes',
-            ['method'],
-            buckets=[64, 256, 1024, 4096, 16384, 65536, 262144, 1048576]
+            buckets=SIZE_BUCKETS,
+            registry=registry
         )
         
         # Active requests gauge
         self.grpc_requests_active = Gauge(
             'grpc_requests_active',
             'Number of active gRPC requests',
-            ['method']
+            ['method'],
+            registry=registry
         )
         
+        # Label-bound children per full method path, so the hot path does one
+        # dict lookup instead of hashing label tuples on every observation
+        self._method_cache: Dict[str, _MethodMetrics] = {}
+        
+        # Method paths are client-controlled, so bound the label values: only
+        # registered methods (or the first max_methods seen, if none are
+        # registered) get their own series; everything else is "unknown"
+        self._known_methods: Set[str] = set()
+        self._max_methods = max_methods
+        self._unknown_children: Optional[_MethodMetrics] = None
+        
         logger.info("gRPC metrics interceptor initialized")
 
+    def register_method(self, method: str) -> None:
+        """Register a method path served by this server.
+        
+        Once any method is registered, unregistered paths are recorded under
+        the "unknown" label instead of creating new series.
+        
+        Args:
+            method: The full gRPC method path (e.g. "/pkg.Service/Method")
+        """
+        self._known_methods.add(method)
+
+    def register_service(self, service: Any) -> None:
+        """Register every method of a service served by this server.
+        
+        Args:
+            service: The protobuf ServiceDescriptor of the service
+        """
+        for method in service.methods:
+            self.register_method(f"/{service.full_name}/{method.name}")
+
+    def _bind_children(self, method_name: str) -> _MethodMetrics:
+        """Bind the per-method metric children for a label value."""
+        return _MethodMetrics(
+            name=method_name,
+            requests_total={},
+            request_duration=self.grpc_request_duration_seconds.labels(method=method_name),
+            requests_active=self.grpc_requests_active.labels(method=method_name),
+        )
+
+    def _get_children(self, method: str) -> _MethodMetrics:
+        """Get the cached label-bound metric children for a method.
+        
+        Args:
+            method: The full gRPC method path
+            
+        Returns:
+            Metric children bound to the method's label
+        """
+        children = self._method_cache.get(method)
+        if children is not None:
+            return children
+        
+        if self._known_methods:
+            allowed = method in self._known_methods
+        else:
+            allowed = len(self._method_cache) < self._max_methods
+        
+        if not allowed:
+            # Not cached under the raw path, which would grow without bound
+            if self._unknown_children is None:
+                self._unknown_children = self._bind_children(UNKNOWN_METHOD)
+            return self._unknown_children
+        
+        method_name = method.rsplit('/', 1)[-1]
+        children = self._bind_children(method_name)
+        self._method_cache[method] = children
+        return children
+
+    def _requests_total(self, children: _MethodMetrics, status: str) -> Any:
+        """Get the request counter child for a method and status."""
+        counter = children.requests_total.get(status)
+        if counter is None:
+            counter = self.grpc_requests_total.labels(method=children.name, status=status)
+            children.requests_total[status] = counter
+        return counter
+
     async def intercept_service(
         self,
         continuation: Callable,
@@ -70,91 +172,73 @@ class GrpcMetricsInterceptor(grpc.aio.ServerInterceptor):
         Returns:
             The result of the service call
         """
-        method = handler_call_details.method
-        start_time = time.time()
+        start_ns = time.monotonic_ns()
         
-        # Extract method name for cleaner metrics
-        method_name = method.split('/')[-1] if '/' in method else method
+        children = self._get_children(handler_call_details.method)
+        method_name = children.name
         
         # Increment active requests
-        self.grpc_requests_active.labels(method=method_name).inc()
+        children.requests_active.inc()
         
         logger.debug("gRPC request started", method=method_name)
         
+        # Stays None for cancellation and other non-Exception exits, which
+        # are not recorded as requests
+        status_code: Optional[str] = None
+        error: Optional[BaseException] = None
+        
         try:
             # Continue with the request
             response = await continuation(handler_call_details)
-            
-            # Record successful request
-            duration = time.time() - start_time
-            
-            self.grpc_requests_total.labels(
-                method=method_name,
-                status='OK'
-            ).inc()
-            
-            self.grpc_request_duration_seconds.labels(
-                method=method_name
-            ).observe(duration)
-            
-            logger.debug(
-                "gRPC request completed successfully",
-                method=method_name,
-                duration_seconds=duration
-            )
-            
+            status_code = 'OK'
             return response
             
         except grpc.RpcError as e:
-            # Record failed request with gRPC status
-            duration = time.time() - start_time
+            # Failed request with gRPC status
             status_code = e.code().name if hasattr(e, 'code') else 'UNKNOWN'
-            
-            self.grpc_requests_total.labels(
-                method=method_name,
-                status=status_code
-            ).inc()
-            
-            self.grpc_request_duration_seconds.labels(
-                method=method_name
-            ).observe(duration)
-            
-            logger.warning(
-                "gRPC request failed",
-                method=method_name,
-                status=status_code,
-                duration_seconds=duration,
-                error=str(e)
-            )
-            
+            error = e
             raise
             
         except Exception as e:
-            # Record failed request with generic error
-            duration = time.time() - start_time
-            
-            self.grpc_requests_total.labels(
-                method=method_name,
-                status='INTERNAL'
-            ).inc()
-            
-            self.grpc_request_duration_seconds.labels(
-                method=method_name
-            ).observe(duration)
-            
-            logger.error(
-                "gRPC request failed with unexpected error",
-                method=method_name,
-                duration_seconds=duration,
-                error=str(e),
-                exc_info=True
-            )
-            
+            # Failed request with generic error
+            status_code = 'INTERNAL'
+            error = e
             raise
             
         finally:
             # Decrement active requests
-            self.grpc_requests_active.labels(method=method_name).dec()
+            children.requests_active.dec()
+            
+            if status_code is not None:
+                # Single clock read for every outcome; monotonic so NTP steps
+                # cannot produce negative durations
+                duration = (time.monotonic_ns() - start_ns) * 1e-9
+                
+                self._requests_total(children, status_code).inc()
+                children.request_duration.observe(duration)
+                
+                if error is None:
+                    logger.debug(
+                        "gRPC request completed successfully",
+                        method=method_name,
+                        duration_seconds=duration
+                    )
+                elif isinstance(error, grpc.RpcError):
+                    logger.warning(
+                        "gRPC request failed",
+                        method=method_name,
+                        status=status_code,
+                        duration_seconds=duration,
+                        error=str(error)
+                    )
+                else:
+                    logger.error(
+                        "gRPC request failed with unexpected error",
+                        method=method_name,
+                        duration_seconds=duration,
+                        error=error.__class__.__name__,
+                        exc_info=error
+                    )
 
     def record_request_size(self, method: str, size_bytes: int) -> None:
         """Record the size of a request message.
@@ -163,12 +247,11 @@ class GrpcMetricsInterceptor(grpc.aio.ServerInterceptor):
             method: The gRPC method name
             size_bytes: Size of the request in bytes
         """
-        method_name = method.split('/')[-1] if '/' in method else method
-        self.grpc_request_size_bytes.labels(method=method_name).observe(size_bytes)
+        self.grpc_request_size_bytes.observe(size_bytes)
         
         logger.debug(
             "Recorded request size",
-            method=method_name,
+            method=method,
             size_bytes=size_bytes
         )
 
@@ -179,12 +262,11 @@ class GrpcMetricsInterceptor(grpc.aio.ServerInterceptor):
             method: The gRPC method name
             size_bytes: Size of the response in bytes
         """
-        method_name = method.split('/')[-1] if '/' in method else method
-        self.grpc_response_size_bytes.labels(method=method_name).observe(size_bytes)
+        self.grpc_response_size_bytes.observe(size_bytes)
         
         logger.debug(
             "Recorded response size",
-            method=method_name,
+            method=method,
             size_bytes=size_bytes
         )
 
@@ -207,7 +289,7 @@ class GrpcClientMetrics:
             'grpc_client_request_duration_seconds',
             'Duration of gRPC client requests in seconds',
             ['method'],
-            buckets=[0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0]
+            buckets=LATENCY_BUCKETS
         )
         
         # Active client requests
@@ -216,6 +298,39 @@ class GrpcClientMetrics:
             'Number of active gRPC client requests',
             ['method']
         )
+        
+        # Label-bound children per method path; client methods are fixed by
+        # the calling code, so this stays small
+        self._method_cache: Dict[str, _MethodMetrics] = {}
+
+    def _get_children(self, method: str) -> _MethodMetrics:
+        """Get the cached label-bound metric children for a client method.
+        
+        Args:
+            method: The gRPC method name
+            
+        Returns:
+            Metric children bound to the method's label
+        """
+        children = self._method_cache.get(method)
+        if children is None:
+            method_name = method.rsplit('/', 1)[-1]
+            children = _MethodMetrics(
+                name=method_name,
+                requests_total={},
+                request_duration=self.grpc_client_request_duration_seconds.labels(method=method_name),
+                requests_active=self.grpc_client_requests_active.labels(method=method_name),
+            )
+            self._method_cache[method] = children
+        return children
+
+    def _requests_total(self, children: _MethodMetrics, status: str) -> Any:
+        """Get the client request counter child for a method and status."""
+        counter = children.requests_total.get(status)
+        if counter is None:
+            counter = self.grpc_client_requests_total.labels(method=children.name, status=status)
+            children.requests_total[status] = counter
+        return counter
 
     def record_client_request_start(self, method: str) -> float:
         """Record the start of a client request.
@@ -224,13 +339,13 @@ class GrpcClientMetrics:
             method: The gRPC method name
             
         Returns:
-            Start time for duration calculation
+            Monotonic start time for duration calculation
         """
-        method_name = method.split('/')[-1] if '/' in method else method
-        self.grpc_client_requests_active.labels(method=method_name).inc()
+        children = self._get_children(method)
+        children.requests_active.inc()
         
-        logger.debug("gRPC client request started", method=method_name)
-        return time.time()
+        logger.debug("gRPC client request started", method=children.name)
+        return time.monotonic()
 
     def record_client_request_success(self, method: str, start_time: float) -> None:
         """Record a successful client request.
@@ -239,23 +354,16 @@ class GrpcClientMetrics:
             method: The gRPC method name
             start_time: When the request started
         """
-        method_name = method.split('/')[-1] if '/' in method else method
-        duration = time.time() - start_time
-        
-        self.grpc_client_requests_total.labels(
-            method=method_name,
-            status='OK'
-        ).inc()
-        
-        self.grpc_client_request_duration_seconds.labels(
-            method=method_name
-        ).observe(duration)
+        children = self._get_children(method)
+        duration = time.monotonic() - start_time
         
-        self.grpc_client_requests_active.labels(method=method_name).dec()
+        self._requests_total(children, 'OK').inc()
+        children.request_duration.observe(duration)
+        children.requests_active.dec()
         
         logger.debug(
             "gRPC client request completed successfully",
-            method=method_name,
+            method=children.name,
             duration_seconds=duration
         )
 
@@ -272,52 +380,36 @@ class GrpcClientMetrics:
             start_time: When the request started
             status_code: The gRPC status code
         """
-        method_name = method.split('/')[-1] if '/' in method else method
-        duration = time.time() - start_time
+        children = self._get_children(method)
+        duration = time.monotonic() - start_time
         
-        self.grpc_client_requests_total.labels(
-            method=method_name,
-            status=status_code
-        ).inc()
-        
-        self.grpc_client_request_duration_seconds.labels(
-            method=method_name
-        ).observe(duration)
-        
-        self.grpc_client_requests_active.labels(method=method_name).dec()
+        self._requests_total(children, status_code).inc()
+        children.request_duration.observe(duration)
+        children.requests_active.dec()
         
         logger.warning(
             "gRPC client request failed",
-            method=method_name,
+            method=children.name,
             status=status_code,
             duration_seconds=duration
         )
 
 
-# Global instances
-grpc_metrics_interceptor: Optional[GrpcMetricsInterceptor] = None
-grpc_client_metrics: Optional[GrpcClientMetrics] = None
-
-
+@functools.cache
 def get_grpc_metrics_interceptor() -> GrpcMetricsInterceptor:
     """Get the global gRPC metrics interceptor.
     
     Returns:
         gRPC metrics interceptor instance
     """
-    global grpc_metrics_interceptor
-    if grpc_metrics_interceptor is None:
-        grpc_metrics_interceptor = GrpcMetricsInterceptor()
-    return grpc_metrics_interceptor
+    return GrpcMetricsInterceptor()
 
 
+@functools.cache
 def get_grpc_client_metrics() -> GrpcClientMetrics:
     """Get the global gRPC client metrics.
     
     Returns:
         gRPC client metrics instance
     """
-    global grpc_client_metrics
-    if grpc_client_metrics is None:
-        grpc_client_metrics = GrpcClientMetrics()
-    return grpc_client_metrics
\ No newline at end of file
+    return GrpcClientMetrics()
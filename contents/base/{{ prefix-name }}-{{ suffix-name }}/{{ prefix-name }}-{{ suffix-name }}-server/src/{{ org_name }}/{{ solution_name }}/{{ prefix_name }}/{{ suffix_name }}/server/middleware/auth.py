@@ -1,7 +1,12 @@
 """Authentication and authorization middleware for gRPC services."""
 
+import copy
+import hashlib
 import logging
-from typing import Any, Callable, Dict, Optional, Set
+import sys
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, FrozenSet, Optional, Set, Tuple
 
 import grpc
 import jwt
@@ -35,17 +40,26 @@ class JWTAuthenticator:
         algorithm: str = "HS256",
         verify_exp: bool = True,
         verify_aud: bool = False,
-        audience: Optional[str] = None
+        audience: Optional[str] = None,
+        cache_max: int = 4096
     ):
         self.secret_key = secret_key
         self.algorithm = algorithm
         self.verify_exp = verify_exp
         self.verify_aud = verify_aud
         self.audience = audience
+        # Decoded payloads keyed by token fingerprint, least recently used first
+        self._cache: "OrderedDict[bytes, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._cache_max = cache_max
     
     def authenticate(self, token: str) -> Dict[str, Any]:
         """Authenticate a JWT token and return the payload.
         
+        Payloads of verified tokens carrying an ``exp`` claim are cached until
+        that time, so clients re-presenting a token skip signature verification.
+        Tokens that are not valid yet (``nbf`` in the future) are not cached.
+        Every call returns its own copy of the payload.
+        
         Args:
             token: JWT token string
             
@@ -55,6 +69,16 @@ class JWTAuthenticator:
         Raises:
             AuthenticationError: If token is invalid
         """
+        key = hashlib.sha256(token.encode()).digest()
+        cached = self._cache.get(key)
+        if cached is not None:
+            exp, payload = cached
+            if exp > time.time():
+                self._cache.move_to_end(key)
+                # Callers may modify the claims; keep the cached copy pristine
+                return copy.deepcopy(payload)
+            del self._cache[key]
+        
         try:
             options = {
                 "verify_exp": self.verify_exp,
@@ -69,7 +93,20 @@ class JWTAuthenticator:
                 options=options
             )
             
-            logger.debug(f"Successfully authenticated user: {payload.get('sub', 'unknown')}")
+            logger.debug("Successfully authenticated user: %s", payload.get('sub', 'unknown'))
+            
+            # Hits only re-check exp, so only cache tokens whose other time
+            # claims cannot change the outcome later
+            now = time.time()
+            exp = payload.get("exp")
+            nbf = payload.get("nbf")
+            if (
+                isinstance(exp, (int, float)) and exp > now
+                and not (isinstance(nbf, (int, float)) and nbf > now)
+            ):
+                self._cache[key] = (float(exp), copy.deepcopy(payload))
+                if len(self._cache) > self._cache_max:
+                    self._cache.popitem(last=False)
             return payload
             
         except jwt.ExpiredSignatureError:
@@ -77,20 +114,27 @@ class JWTAuthenticator:
         except jwt.InvalidTokenError as e:
             raise AuthenticationError(f"Invalid token: {str(e)}", StatusCode.UNAUTHENTICATED)
         except Exception as e:
-            logger.error(f"Unexpected error during authentication: {e}")
+            logger.error("Unexpected error during authentication: %s", e)
             raise AuthenticationError("Authentication failed", StatusCode.INTERNAL)
 
 
 class RoleBasedAuthorizer:
     """Role-based authorization handler."""
     
+    _EMPTY: FrozenSet[str] = frozenset()
+    
     def __init__(self, method_permissions: Dict[str, Set[str]]):
         """Initialize with method-to-roles mapping.
         
         Args:
             method_permissions: Dict mapping method names to required roles
         """
-        self.method_permissions = method_permissions
+        # Configured method names are interned once here; request paths are not,
+        # since they are client-supplied and the lookup hashes them anyway
+        self.method_permissions: Dict[str, FrozenSet[str]] = {
+            sys.intern(method): frozenset(roles)
+            for method, roles in method_permissions.items()
+        }
     
     def authorize(self, method_name: str, user_roles: Set[str]) -> None:
         """Check if user has required permissions for the method.
@@ -102,23 +146,23 @@ class RoleBasedAuthorizer:
         Raises:
             AuthorizationError: If user lacks required permissions
         """
-        required_roles = self.method_permissions.get(method_name, set())
+        required_roles = self.method_permissions.get(method_name, self._EMPTY)
         
         if not required_roles:
             # No specific permissions required
             return
         
-        if not user_roles.intersection(required_roles):
+        if not any(role in user_roles for role in required_roles):
             logger.warning(
-                f"Authorization failed for method {method_name}. "
-                f"Required roles: {required_roles}, User roles: {user_roles}"
+                "Authorization failed for method %s. Required roles: %s, User roles: %s",
+                method_name, required_roles, user_roles
             )
             raise AuthorizationError(
                 f"Insufficient permissions for {method_name}",
                 StatusCode.PERMISSION_DENIED
             )
         
-        logger.debug(f"Authorization successful for method {method_name}")
+        logger.debug("Authorization successful for method %s", method_name)
 
 
 class AuthInterceptor(grpc.aio.ServerInterceptor):
@@ -139,10 +183,12 @@ class AuthInterceptor(grpc.aio.ServerInterceptor):
         """
         self.authenticator = authenticator
         self.authorizer = authorizer
-        self.public_methods = public_methods or {
-            "/grpc.health.v1.Health/Check",
-            "/grpc.reflection.v1alpha.ServerReflection/ServerReflectionInfo"
-        }
+        self.public_methods: FrozenSet[str] = frozenset(
+            sys.intern(method) for method in public_methods or (
+                "/grpc.health.v1.Health/Check",
+                "/grpc.reflection.v1alpha.ServerReflection/ServerReflectionInfo"
+            )
+        )
     
     async def intercept_service(
         self,
@@ -156,12 +202,15 @@ class AuthInterceptor(grpc.aio.ServerInterceptor):
         if method_name in self.public_methods:
             return await continuation(handler_call_details)
         
-        # Extract authorization header
-        metadata = dict(handler_call_details.invocation_metadata)
-        auth_header = metadata.get("authorization")
+        # Extract authorization header without materializing the metadata;
+        # later entries win, as they did with the dict lookup
+        auth_header = None
+        for key, value in handler_call_details.invocation_metadata:
+            if key == "authorization":
+                auth_header = value
         
         if not auth_header:
-            logger.warning(f"Missing authorization header for method: {method_name}")
+            logger.warning("Missing authorization header for method: %s", method_name)
             raise grpc.aio.AioRpcError(
                 grpc.StatusCode.UNAUTHENTICATED,
                 "Missing authorization header"
@@ -169,7 +218,7 @@ class AuthInterceptor(grpc.aio.ServerInterceptor):
         
         # Extract Bearer token
         if not auth_header.startswith("Bearer "):
-            logger.warning(f"Invalid authorization header format for method: {method_name}")
+            logger.warning("Invalid authorization header format for method: %s", method_name)
             raise grpc.aio.AioRpcError(
                 grpc.StatusCode.UNAUTHENTICATED,
                 "Invalid authorization header format"
@@ -186,11 +235,11 @@ class AuthInterceptor(grpc.aio.ServerInterceptor):
             user_roles = set(payload.get("roles", []))
             
             # Store user context in metadata for downstream use
-            enhanced_metadata = [
+            enhanced_metadata = (
+                *handler_call_details.invocation_metadata,
                 ("x-user-id", user_id),
                 ("x-user-roles", ",".join(user_roles)),
-            ]
-            enhanced_metadata.extend(handler_call_details.invocation_metadata)
+            )
             
             # Create new handler call details with enhanced metadata
             enhanced_handler_call_details = grpc.HandlerCallDetails(
@@ -202,17 +251,17 @@ class AuthInterceptor(grpc.aio.ServerInterceptor):
             if self.authorizer:
                 self.authorizer.authorize(method_name, user_roles)
             
-            logger.info(f"Authenticated request for user {user_id} to method {method_name}")
+            logger.info("Authenticated request for user %s to method %s", user_id, method_name)
             return await continuation(enhanced_handler_call_details)
             
         except AuthenticationError as e:
-            logger.warning(f"Authentication failed for method {method_name}: {e}")
+            logger.warning("Authentication failed for method %s: %s", method_name, e)
             raise grpc.aio.AioRpcError(e.status_code, str(e))
         except AuthorizationError as e:
-            logger.warning(f"Authorization failed for method {method_name}: {e}")
+            logger.warning("Authorization failed for method %s: %s", method_name, e)
             raise grpc.aio.AioRpcError(e.status_code, str(e))
         except Exception as e:
-            logger.error(f"Unexpected error in auth interceptor: {e}")
+            logger.error("Unexpected error in auth interceptor: %s", e)
             raise grpc.aio.AioRpcError(
                 grpc.StatusCode.INTERNAL,
                 "Internal authentication error"
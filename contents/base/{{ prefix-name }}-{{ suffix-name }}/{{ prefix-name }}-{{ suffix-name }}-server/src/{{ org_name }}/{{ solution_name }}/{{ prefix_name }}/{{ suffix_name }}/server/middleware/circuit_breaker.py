@@ -3,12 +3,33 @@
 import asyncio
 import time
 from enum import Enum
-from typing import Any, Callable, Optional
+from typing import Any, Callable, Dict, Optional
+from weakref import WeakKeyDictionary
 
 import structlog
 
 logger = structlog.get_logger(__name__)
 
+# Number of registry lock shards; a power of two so the index is a mask
+_REGISTRY_SHARDS = 32
+
+# Whether a callable is a coroutine function never changes, so remember it
+_IS_CORO: "WeakKeyDictionary[Callable, bool]" = WeakKeyDictionary()
+
+
+def _is_coro(func: Callable) -> bool:
+    """Cached ``asyncio.iscoroutinefunction``."""
+    # Bound methods are created per attribute access; key on the function itself
+    key = getattr(func, "__func__", func)
+    try:
+        is_coro = _IS_CORO.get(key)
+        if is_coro is None:
+            is_coro = _IS_CORO.setdefault(key, asyncio.iscoroutinefunction(func))
+        return is_coro
+    except TypeError:
+        # Not weak-referenceable (e.g. builtins)
+        return asyncio.iscoroutinefunction(func)
+
 
 class CircuitState(Enum):
     """Circuit breaker states."""
@@ -25,6 +46,12 @@ class CircuitBreakerError(Exception):
 class CircuitBreaker:
     """Circuit breaker implementation for protecting against cascading failures."""
 
+    __slots__ = (
+        'failure_threshold', 'timeout', 'expected_exception', 'name',
+        'state', 'failure_count', 'last_failure_time', 'success_count',
+        '_lock'
+    )
+
     def __init__(
         self,
         failure_threshold: int = 5,
@@ -67,15 +94,20 @@ class CircuitBreaker:
             CircuitBreakerError: If circuit is open
             Exception: Original function exceptions
         """
-        async with self._lock:
+        # The closed state is read without the lock; it is only taken when the
+        # circuit may actually change state
+        if self.state != CircuitState.CLOSED:
             # Check if circuit should transition to half-open
             if self.state == CircuitState.OPEN and self._should_attempt_reset():
-                self.state = CircuitState.HALF_OPEN
-                self.success_count = 0
-                logger.info(
-                    "Circuit breaker transitioning to half-open",
-                    circuit_name=self.name
-                )
+                async with self._lock:
+                    # Another task may have transitioned while we waited
+                    if self.state == CircuitState.OPEN and self._should_attempt_reset():
+                        self.state = CircuitState.HALF_OPEN
+                        self.success_count = 0
+                        logger.info(
+                            "Circuit breaker transitioning to half-open",
+                            circuit_name=self.name
+                        )
 
             # If circuit is open, reject the request
             if self.state == CircuitState.OPEN:
@@ -90,21 +122,32 @@ class CircuitBreaker:
 
         # Execute the function
         try:
-            result = await func(*args, **kwargs) if asyncio.iscoroutinefunction(func) else func(*args, **kwargs)
+            result = await func(*args, **kwargs) if _is_coro(func) else func(*args, **kwargs)
             await self._on_success()
             return result
         except self.expected_exception as e:
             await self._on_failure()
             raise
 
+    def _now(self) -> float:
+        """Current monotonic time.
+        
+        Not tied to an event loop, as registry breakers outlive individual loops.
+        """
+        return time.monotonic()
+
     def _should_attempt_reset(self) -> bool:
         """Check if enough time has passed to attempt reset."""
         if self.last_failure_time is None:
             return False
-        return time.time() - self.last_failure_time >= self.timeout
+        return self._now() - self.last_failure_time >= self.timeout
 
     async def _on_success(self):
         """Handle successful function execution."""
+        # Nothing to record for a healthy closed circuit
+        if self.state == CircuitState.CLOSED and self.failure_count == 0:
+            return
+        
         async with self._lock:
             if self.state == CircuitState.HALF_OPEN:
                 self.success_count += 1
@@ -125,7 +168,7 @@ class CircuitBreaker:
         """Handle failed function execution."""
         async with self._lock:
             self.failure_count += 1
-            self.last_failure_time = time.time()
+            self.last_failure_time = self._now()
 
             if self.state == CircuitState.HALF_OPEN:
                 # Failed during half-open, go back to open
@@ -170,7 +213,7 @@ class CircuitBreaker:
             self.success_count = 0
             logger.info("Circuit breaker manually reset", circuit_name=self.name)
 
-    def get_stats(self) -> dict:
+    def get_stats(self) -> Dict[str, Any]:
         """Get circuit breaker statistics."""
         return {
             "name": self.name,
@@ -185,6 +228,8 @@ class CircuitBreaker:
 class DatabaseCircuitBreaker(CircuitBreaker):
     """Circuit breaker specifically for database operations."""
 
+    __slots__ = ()
+
     def __init__(self, name: str = "database"):
         """Initialize database circuit breaker with appropriate settings."""
         super().__init__(
@@ -198,6 +243,8 @@ class DatabaseCircuitBreaker(CircuitBreaker):
 class ExternalServiceCircuitBreaker(CircuitBreaker):
     """Circuit breaker for external service calls."""
 
+    __slots__ = ()
+
     def __init__(self, service_name: str):
         """Initialize external service circuit breaker.
         
@@ -216,9 +263,41 @@ class CircuitBreakerRegistry:
     """Registry for managing multiple circuit breakers."""
 
     def __init__(self):
-        """Initialize circuit breaker registry."""
-        self._breakers: dict[str, CircuitBreaker] = {}
-        self._lock = asyncio.Lock()
+        """Initialize circuit breaker registry.
+        
+        Breakers are spread over lock-protected shards by name, so creating or
+        looking up unrelated breakers does not serialize on a single lock.
+        """
+        self._shards: list[dict[str, CircuitBreaker]] = [
+            {} for _ in range(_REGISTRY_SHARDS)
+        ]
+        self._locks: list[asyncio.Lock] = [
+            asyncio.Lock() for _ in range(_REGISTRY_SHARDS)
+        ]
+        # Registry keys for database and external service names, built once
+        self._db_key_cache: dict[str, str] = {}
+        self._ext_key_cache: dict[str, str] = {}
+
+    async def _get_or_create(
+        self,
+        name: str,
+        factory: Callable[[], CircuitBreaker],
+        created_message: str
+    ) -> CircuitBreaker:
+        """Get a breaker from its shard, creating it under the shard lock if missing."""
+        index = hash(name) & (_REGISTRY_SHARDS - 1)
+        shard = self._shards[index]
+        
+        # Existing breakers are returned without taking the lock
+        breaker = shard.get(name)
+        if breaker is not None:
+            return breaker
+        
+        async with self._locks[index]:
+            if name not in shard:
+                shard[name] = factory()
+                logger.info(created_message, name=name)
+            return shard[name]
 
     async def get_breaker(self, name: str, **kwargs) -> CircuitBreaker:
         """Get or create a circuit breaker.
@@ -230,11 +309,11 @@ class CircuitBreakerRegistry:
         Returns:
             Circuit breaker instance
         """
-        async with self._lock:
-            if name not in self._breakers:
-                self._breakers[name] = CircuitBreaker(name=name, **kwargs)
-                logger.info("Created new circuit breaker", name=name)
-            return self._breakers[name]
+        return await self._get_or_create(
+            name,
+            lambda: CircuitBreaker(name=name, **kwargs),
+            "Created new circuit breaker"
+        )
 
     async def get_database_breaker(self, db_name: str = "default") -> DatabaseCircuitBreaker:
         """Get or create a database circuit breaker.
@@ -245,12 +324,14 @@ class CircuitBreakerRegistry:
         Returns:
             Database circuit breaker instance
         """
-        name = f"database_{db_name}"
-        async with self._lock:
-            if name not in self._breakers:
-                self._breakers[name] = DatabaseCircuitBreaker(name)
-                logger.info("Created new database circuit breaker", name=name)
-            return self._breakers[name]
+        name = self._db_key_cache.get(db_name)
+        if name is None:
+            name = self._db_key_cache.setdefault(db_name, f"database_{db_name}")
+        return await self._get_or_create(
+            name,
+            lambda: DatabaseCircuitBreaker(name),
+            "Created new database circuit breaker"
+        )
 
     async def get_external_service_breaker(self, service_name: str) -> ExternalServiceCircuitBreaker:
         """Get or create an external service circuit breaker.
@@ -261,27 +342,37 @@ class CircuitBreakerRegistry:
         Returns:
             External service circuit breaker instance
         """
-        name = f"external_service_{service_name}"
-        async with self._lock:
-            if name not in self._breakers:
-                self._breakers[name] = ExternalServiceCircuitBreaker(service_name)
-                logger.info("Created new external service circuit breaker", name=name)
-            return self._breakers[name]
+        name = self._ext_key_cache.get(service_name)
+        if name is None:
+            name = self._ext_key_cache.setdefault(
+                service_name, f"external_service_{service_name}"
+            )
+        return await self._get_or_create(
+            name,
+            lambda: ExternalServiceCircuitBreaker(service_name),
+            "Created new external service circuit breaker"
+        )
 
-    def get_all_stats(self) -> list[dict]:
+    def get_all_stats(self) -> list[Dict[str, Any]]:
         """Get statistics for all circuit breakers.
         
         Returns:
             List of circuit breaker statistics
         """
-        return [breaker.get_stats() for breaker in self._breakers.values()]
+        return [
+            breaker.get_stats()
+            for shard in self._shards
+            for breaker in shard.values()
+        ]
 
     async def reset_all(self):
         """Reset all circuit breakers."""
-        async with self._lock:
-            for breaker in self._breakers.values():
-                await breaker.reset()
-            logger.info("Reset all circuit breakers")
+        # Shard locks are always taken in index order
+        for lock, shard in zip(self._locks, self._shards):
+            async with lock:
+                for breaker in shard.values():
+                    await breaker.reset()
+        logger.info("Reset all circuit breakers")
 
 
 # Global registry instance
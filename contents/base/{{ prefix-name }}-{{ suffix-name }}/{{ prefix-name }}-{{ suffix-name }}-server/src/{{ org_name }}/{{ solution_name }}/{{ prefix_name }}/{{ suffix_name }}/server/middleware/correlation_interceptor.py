@@ -1,11 +1,12 @@
 """gRPC interceptor for correlation ID management."""
 
-import uuid
-from typing import Any, Callable
+import secrets
+from typing import Any, Callable, Optional
 
 import grpc
 import structlog
 from contextvars import ContextVar
+from structlog.contextvars import bind_contextvars, clear_contextvars
 
 # Context variable for correlation ID
 correlation_id_context: ContextVar[str] = ContextVar('correlation_id', default='')
@@ -23,6 +24,30 @@ def set_correlation_id(correlation_id: str) -> None:
     correlation_id_context.set(correlation_id)
 
 
+def bind_correlation_id(correlation_id: Optional[str]) -> str:
+    """Bind a request's correlation ID, generating one if it was not provided.
+    
+    Args:
+        correlation_id: Correlation ID from metadata, if present
+        
+    Returns:
+        The correlation ID in effect for the request
+    """
+    # Generate a new correlation ID if not provided (128 random bits as hex)
+    if not correlation_id:
+        correlation_id = secrets.token_hex(16)
+    
+    # Set correlation ID in context
+    set_correlation_id(correlation_id)
+    
+    # Add correlation ID to structured logging context. The handler runs in
+    # this context after the interceptor returns, so the binding is reset
+    # per request here rather than cleared on the way out
+    clear_contextvars()
+    bind_contextvars(correlation_id=correlation_id)
+    return correlation_id
+
+
 class CorrelationIdInterceptor(grpc.aio.ServerInterceptor):
     """gRPC server interceptor for managing correlation IDs."""
 
@@ -41,18 +66,13 @@ class CorrelationIdInterceptor(grpc.aio.ServerInterceptor):
             The result of the service call
         """
         # Extract correlation ID from metadata
-        metadata = dict(handler_call_details.invocation_metadata)
-        correlation_id = metadata.get('x-correlation-id')
-        
-        # Generate a new correlation ID if not provided
-        if not correlation_id:
-            correlation_id = str(uuid.uuid4())
-        
-        # Set correlation ID in context
-        set_correlation_id(correlation_id)
+        # Later entries win, as in the tracing and observability interceptors
+        correlation_id = None
+        for key, value in handler_call_details.invocation_metadata:
+            if key == 'x-correlation-id':
+                correlation_id = value
         
-        # Add correlation ID to structured logging context
-        logger.bind(correlation_id=correlation_id)
+        correlation_id = bind_correlation_id(correlation_id)
         
         logger.debug(
             "Processing gRPC request",
@@ -69,8 +89,8 @@ class CorrelationIdInterceptor(grpc.aio.ServerInterceptor):
                 "gRPC request failed",
                 method=handler_call_details.method,
                 correlation_id=correlation_id,
-                error=str(e),
-                exc_info=True
+                error=e.__class__.__name__,
+                exc_info=e
             )
             raise
 
@@ -98,9 +118,12 @@ class CorrelationIdClientInterceptor(grpc.aio.UnaryUnaryClientInterceptor):
         correlation_id = get_correlation_id()
         
         if correlation_id:
-            # Add correlation ID to metadata
-            metadata = list(client_call_details.metadata or [])
-            metadata.append(('x-correlation-id', correlation_id))
+            # Add correlation ID to metadata, building the new tuple directly
+            correlation_entry = ('x-correlation-id', correlation_id)
+            if client_call_details.metadata:
+                metadata = (*client_call_details.metadata, correlation_entry)
+            else:
+                metadata = (correlation_entry,)
             
             # Create new call details with updated metadata
             new_details = client_call_details._replace(metadata=metadata)
@@ -1,19 +1,42 @@
 """Rate limiting middleware for gRPC services."""
 
 import asyncio
+import functools
 import time
 from collections import defaultdict
-from typing import Any, Callable, Dict
+from typing import Any, Callable, Dict, Optional
 
 import grpc
 import structlog
 
 logger = structlog.get_logger(__name__)
 
+# Number of bucket shards; a power of two so the index is a mask
+_BUCKET_SHARDS = 32
+
+# Key shared by calls that carry no client ID
+_DEFAULT_CLIENT_KEY = "default"
+
+
+@functools.lru_cache(maxsize=256)
+def _rejecting_handler(message: str) -> grpc.RpcMethodHandler:
+    """Build (once per message) a handler that fails the call with RESOURCE_EXHAUSTED.
+    
+    Interceptors only see the call details, not a servicer context, so a
+    rejected call is answered by returning this handler instead of the real one.
+    """
+    async def reject(request: Any, context: grpc.aio.ServicerContext) -> None:
+        await context.abort(grpc.StatusCode.RESOURCE_EXHAUSTED, message)
+    
+    return grpc.unary_unary_rpc_method_handler(reject)
+
 
 class TokenBucket:
     """Token bucket implementation for rate limiting."""
 
+    # One bucket exists per client (and method), so skip the per-instance dict
+    __slots__ = ('capacity', 'refill_rate', 'tokens', 'last_refill')
+
     def __init__(self, capacity: int, refill_rate: float):
         """Initialize token bucket.
         
@@ -24,32 +47,34 @@ class TokenBucket:
         self.capacity = capacity
         self.refill_rate = refill_rate
         self.tokens = capacity
-        self.last_refill = time.time()
-        self._lock = asyncio.Lock()
+        self.last_refill = time.monotonic()
 
-    async def consume(self, tokens: int = 1) -> bool:
+    def consume(self, tokens: int = 1) -> bool:
         """Try to consume tokens from the bucket.
         
+        Synchronous and await-free, so the update is atomic with respect to
+        other coroutines on the event loop without a lock.
+        
         Args:
             tokens: Number of tokens to consume
             
         Returns:
             True if tokens were consumed, False if insufficient tokens
         """
-        async with self._lock:
-            now = time.time()
-            # Refill tokens based on time elapsed
-            elapsed = now - self.last_refill
-            self.tokens = min(
-                self.capacity,
-                self.tokens + (elapsed * self.refill_rate)
-            )
-            self.last_refill = now
+        now = time.monotonic()
+        
+        # Refill tokens based on time elapsed
+        elapsed = now - self.last_refill
+        self.tokens = min(
+            self.capacity,
+            self.tokens + (elapsed * self.refill_rate)
+        )
+        self.last_refill = now
 
-            if self.tokens >= tokens:
-                self.tokens -= tokens
-                return True
-            return False
+        if self.tokens >= tokens:
+            self.tokens -= tokens
+            return True
+        return False
 
 
 class RateLimitingInterceptor(grpc.aio.ServerInterceptor):
@@ -72,10 +97,24 @@ class RateLimitingInterceptor(grpc.aio.ServerInterceptor):
         self.burst_capacity = burst_capacity
         self.cleanup_interval = cleanup_interval
         
-        # Store token buckets per client
-        self.buckets: Dict[str, TokenBucket] = {}
-        self.last_cleanup = time.time()
-        self._lock = asyncio.Lock()
+        # Store token buckets per client, sharded by key so creating buckets
+        # for different clients does not serialize on one lock
+        self._shards: list[Dict[str, TokenBucket]] = [
+            {} for _ in range(_BUCKET_SHARDS)
+        ]
+        
+        # Formatted "client:<id>" keys, so repeat callers reuse one string.
+        # Client IDs are caller-supplied, so the cache stops growing at a fixed size
+        self._client_key_cache: Dict[str, str] = {}
+        self._client_key_cache_max = 4096
+        self._shard_locks: list[asyncio.Lock] = [
+            asyncio.Lock() for _ in range(_BUCKET_SHARDS)
+        ]
+        self.last_cleanup = time.monotonic()
+        
+        # Periodic bucket cleanup runs in the background, started on the first
+        # request because the interceptor may be built before the loop exists
+        self._cleanup_task: Optional[asyncio.Task] = None
 
     def _get_client_key(self, handler_call_details: grpc.HandlerCallDetails) -> str:
         """Extract client identifier for rate limiting.
@@ -88,37 +127,81 @@ class RateLimitingInterceptor(grpc.aio.ServerInterceptor):
         """
         # In a real implementation, you'd extract the client IP or user ID
         # For now, we'll use a simple peer identifier
-        metadata = dict(handler_call_details.invocation_metadata)
         
         # Try to get client ID from metadata (e.g., API key, user ID)
-        client_id = metadata.get('x-client-id')
+        # Later entries win, as in the tracing and observability interceptors
+        client_id = None
+        for key, value in handler_call_details.invocation_metadata:
+            if key == 'x-client-id':
+                client_id = value
+        return self.client_key_for(client_id)
+
+    def client_key_for(self, client_id: Optional[str]) -> str:
+        """Map an ``x-client-id`` metadata value to a rate limit key.
+        
+        Args:
+            client_id: Client ID from metadata, if present
+            
+        Returns:
+            Client identifier used to select the token bucket
+        """
         if client_id:
-            return f"client:{client_id}"
+            client_key = self._client_key_cache.get(client_id)
+            if client_key is None:
+                client_key = f"client:{client_id}"
+                if len(self._client_key_cache) < self._client_key_cache_max:
+                    self._client_key_cache[client_id] = client_key
+            return client_key
         
         # Fall back to peer address (in real implementation)
         # peer = handler_call_details.peer or "unknown"
-        return "default"  # For demonstration, use a default key
-
-    async def _cleanup_old_buckets(self):
-        """Clean up old, unused token buckets."""
-        now = time.time()
-        if now - self.last_cleanup < self.cleanup_interval:
-            return
-
-        async with self._lock:
-            # Remove buckets that haven't been used recently
-            cutoff_time = now - self.cleanup_interval
-            to_remove = []
-            
-            for key, bucket in self.buckets.items():
-                if bucket.last_refill < cutoff_time:
-                    to_remove.append(key)
-            
-            for key in to_remove:
-                del self.buckets[key]
-                logger.debug("Cleaned up unused rate limit bucket", client_key=key)
-            
-            self.last_cleanup = now
+        return _DEFAULT_CLIENT_KEY  # For demonstration, use a default key
+
+    def _ensure_cleanup_task(self) -> None:
+        """Start the background cleanup task if it is not running yet."""
+        if self._cleanup_task is None:
+            self._cleanup_task = asyncio.create_task(self._cleanup_loop())
+
+    async def _cleanup_loop(self) -> None:
+        """Clean up old buckets every ``cleanup_interval`` seconds."""
+        while True:
+            await asyncio.sleep(self.cleanup_interval)
+            try:
+                await self._cleanup_old_buckets(time.monotonic())
+            except Exception as e:
+                logger.warning("Failed to clean up rate limit buckets", error=str(e))
+
+    async def close(self) -> None:
+        """Stop the background cleanup task."""
+        task, self._cleanup_task = self._cleanup_task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    async def _cleanup_old_buckets(self, now: float):
+        """Clean up old, unused token buckets.
+        
+        Args:
+            now: Current ``time.monotonic()`` value
+        """
+        self.last_cleanup = now
+
+        # Remove buckets that haven't been used recently, one shard at a time
+        # so cleanup never blocks every client at once
+        cutoff_time = now - self.cleanup_interval
+        for lock, shard in zip(self._shard_locks, self._shards):
+            async with lock:
+                to_remove = [
+                    key for key, bucket in shard.items()
+                    if bucket.last_refill < cutoff_time
+                ]
+                
+                for key in to_remove:
+                    del shard[key]
+                    logger.debug("Cleaned up unused rate limit bucket", client_key=key)
 
     async def _get_bucket(self, client_key: str) -> TokenBucket:
         """Get or create a token bucket for a client.
@@ -129,68 +212,90 @@ class RateLimitingInterceptor(grpc.aio.ServerInterceptor):
         Returns:
             Token bucket for the client
         """
-        async with self._lock:
-            if client_key not in self.buckets:
-                self.buckets[client_key] = TokenBucket(
+        index = hash(client_key) & (_BUCKET_SHARDS - 1)
+        shard = self._shards[index]
+        
+        # Existing buckets are returned without taking the lock
+        bucket = shard.get(client_key)
+        if bucket is not None:
+            return bucket
+        
+        async with self._shard_locks[index]:
+            if client_key not in shard:
+                shard[client_key] = TokenBucket(
                     capacity=self.burst_capacity,
                     refill_rate=self.requests_per_second
                 )
                 logger.debug("Created new rate limit bucket", client_key=client_key)
             
-            return self.buckets[client_key]
+            return shard[client_key]
 
-    async def intercept_service(
+    async def check_rate_limit(
         self,
-        continuation: Callable,
-        handler_call_details: grpc.HandlerCallDetails
-    ) -> Any:
-        """Intercept gRPC calls to apply rate limiting.
+        client_key: str,
+        method: str
+    ) -> Optional[grpc.RpcMethodHandler]:
+        """Consume a token for a call.
         
         Args:
-            continuation: The next interceptor or handler
-            handler_call_details: Details about the handler call
+            client_key: Client identifier
+            method: Full gRPC method path
             
         Returns:
-            The result of the service call
-            
-        Raises:
-            grpc.RpcError: If rate limit is exceeded
+            None if the call is allowed, otherwise a handler rejecting it
         """
-        # Clean up old buckets periodically
-        await self._cleanup_old_buckets()
-        
-        # Get client identifier
-        client_key = self._get_client_key(handler_call_details)
+        self._ensure_cleanup_task()
         
         # Get token bucket for this client
         bucket = await self._get_bucket(client_key)
         
         # Try to consume a token
-        if await bucket.consume():
+        if bucket.consume():
             logger.debug(
                 "Request allowed by rate limiter",
                 client_key=client_key,
-                method=handler_call_details.method,
+                method=method,
                 remaining_tokens=bucket.tokens
             )
+            return None
+        
+        # Rate limit exceeded
+        logger.warning(
+            "Rate limit exceeded",
+            client_key=client_key,
+            method=method,
+            requests_per_second=self.requests_per_second
+        )
+        
+        # Return rate limit error
+        return _rejecting_handler(
+            "Rate limit exceeded. Please slow down your requests."
+        )
+
+    async def intercept_service(
+        self,
+        continuation: Callable,
+        handler_call_details: grpc.HandlerCallDetails
+    ) -> Any:
+        """Intercept gRPC calls to apply rate limiting.
+        
+        Args:
+            continuation: The next interceptor or handler
+            handler_call_details: Details about the handler call
             
-            # Continue with the request
-            return await continuation(handler_call_details)
-        else:
-            # Rate limit exceeded
-            logger.warning(
-                "Rate limit exceeded",
-                client_key=client_key,
-                method=handler_call_details.method,
-                requests_per_second=self.requests_per_second
-            )
-            
-            # Return rate limit error
-            context = grpc.aio.ServicerContext()
-            await context.abort(
-                grpc.StatusCode.RESOURCE_EXHAUSTED,
-                "Rate limit exceeded. Please slow down your requests."
-            )
+        Returns:
+            The result of the service call, or a handler rejecting it with
+            RESOURCE_EXHAUSTED if the rate limit is exceeded
+        """
+        rejection = await self.check_rate_limit(
+            self._get_client_key(handler_call_details),
+            handler_call_details.method
+        )
+        if rejection is not None:
+            return rejection
+        
+        # Continue with the request
+        return await continuation(handler_call_details)
 
 
 class MethodBasedRateLimitingInterceptor(RateLimitingInterceptor):
@@ -218,6 +323,11 @@ class MethodBasedRateLimitingInterceptor(RateLimitingInterceptor):
             'GetExample': {'rps': 100, 'burst': 200},
             'GetExamples': {'rps': 50, 'burst': 100}
         }
+        
+        # Resolved (rps, burst) per full method path, filled on first sight.
+        # Paths are client-supplied, so the cache stops growing at a fixed size
+        self._method_cache: Dict[str, tuple[int, int]] = {}
+        self._method_cache_max = 1024
 
     def _get_method_limits(self, method: str) -> tuple[int, int]:
         """Get rate limits for a specific method.
@@ -228,14 +338,22 @@ class MethodBasedRateLimitingInterceptor(RateLimitingInterceptor):
         Returns:
             Tuple of (requests_per_second, burst_capacity)
         """
+        cached = self._method_cache.get(method)
+        if cached is not None:
+            return cached
+        
         # Extract method name from full path
-        method_name = method.split('/')[-1] if '/' in method else method
+        method_name = method.rsplit('/', 1)[-1]
         
         if method_name in self.method_limits:
             limits = self.method_limits[method_name]
-            return limits['rps'], limits['burst']
+            resolved = (limits['rps'], limits['burst'])
+        else:
+            resolved = (self.requests_per_second, self.burst_capacity)
         
-        return self.requests_per_second, self.burst_capacity
+        if len(self._method_cache) < self._method_cache_max:
+            self._method_cache[method] = resolved
+        return resolved
 
     async def _get_bucket(self, client_key: str, method: str) -> TokenBucket:
         """Get or create a token bucket for a client and method.
@@ -250,10 +368,17 @@ class MethodBasedRateLimitingInterceptor(RateLimitingInterceptor):
         # Include method in the bucket key
         bucket_key = f"{client_key}:{method}"
         
-        async with self._lock:
-            if bucket_key not in self.buckets:
+        index = hash(bucket_key) & (_BUCKET_SHARDS - 1)
+        shard = self._shards[index]
+        
+        bucket = shard.get(bucket_key)
+        if bucket is not None:
+            return bucket
+        
+        async with self._shard_locks[index]:
+            if bucket_key not in shard:
                 rps, burst = self._get_method_limits(method)
-                self.buckets[bucket_key] = TokenBucket(
+                shard[bucket_key] = TokenBucket(
                     capacity=burst,
                     refill_rate=rps
                 )
@@ -265,24 +390,21 @@ class MethodBasedRateLimitingInterceptor(RateLimitingInterceptor):
                     burst=burst
                 )
             
-            return self.buckets[bucket_key]
+            return shard[bucket_key]
 
-    async def intercept_service(
+    async def check_rate_limit(
         self,
-        continuation: Callable,
-        handler_call_details: grpc.HandlerCallDetails
-    ) -> Any:
-        """Intercept gRPC calls to apply method-based rate limiting."""
-        await self._cleanup_old_buckets()
-        
-        client_key = self._get_client_key(handler_call_details)
-        method = handler_call_details.method
+        client_key: str,
+        method: str
+    ) -> Optional[grpc.RpcMethodHandler]:
+        """Consume a token from the client's bucket for this method."""
+        self._ensure_cleanup_task()
         
         # Get method-specific token bucket
         bucket = await self._get_bucket(client_key, method)
+        rps, burst = self._get_method_limits(method)
         
-        if await bucket.consume():
-            rps, burst = self._get_method_limits(method)
+        if bucket.consume():
             logger.debug(
                 "Request allowed by method-based rate limiter",
                 client_key=client_key,
@@ -290,20 +412,16 @@ class MethodBasedRateLimitingInterceptor(RateLimitingInterceptor):
                 remaining_tokens=bucket.tokens,
                 method_rps=rps
             )
-            
-            return await continuation(handler_call_details)
-        else:
-            rps, burst = self._get_method_limits(method)
-            logger.warning(
-                "Method-based rate limit exceeded",
-                client_key=client_key,
-                method=method,
-                method_rps=rps
-            )
-            
-            context = grpc.aio.ServicerContext()
-            await context.abort(
-                grpc.StatusCode.RESOURCE_EXHAUSTED,
-                f"Rate limit exceeded for method {method.split('/')[-1]}. "
-                f"Limit: {rps} requests per second."
-            )
\ No newline at end of file
+            return None
+        
+        logger.warning(
+            "Method-based rate limit exceeded",
+            client_key=client_key,
+            method=method,
+            method_rps=rps
+        )
+        
+        return _rejecting_handler(
+            f"Rate limit exceeded for method {method.rsplit('/', 1)[-1]}. "
+            f"Limit: {rps} requests per second."
+        )
@@ -9,7 +9,7 @@ from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExport
 from opentelemetry.instrumentation.grpc import GrpcInstrumentorServer
 from opentelemetry.instrumentation.sqlalchemy import SQLAlchemyInstrumentor
 from opentelemetry.instrumentation.asyncpg import AsyncPGInstrumentor
-from opentelemetry.propagate import extract, inject
+from opentelemetry.propagate import extract, get_global_textmap
 from opentelemetry.sdk.resources import SERVICE_NAME, SERVICE_VERSION, Resource
 from opentelemetry.sdk.trace import TracerProvider
 from opentelemetry.sdk.trace.export import BatchSpanProcessor
@@ -18,10 +18,34 @@ from opentelemetry.trace import Status, StatusCode
 
 logger = logging.getLogger(__name__)
 
+# Per-RPC constants, resolved once instead of on every call
+_RPC_SYSTEM_GRPC = "grpc"
+_OK_CODE = grpc.StatusCode.OK.value[0]
+_ATTR_RPC_SYSTEM = SpanAttributes.RPC_SYSTEM
+_ATTR_RPC_SERVICE = SpanAttributes.RPC_SERVICE
+_ATTR_RPC_METHOD = SpanAttributes.RPC_METHOD
+_ATTR_RPC_STATUS = SpanAttributes.RPC_GRPC_STATUS_CODE
+
+
+def _split_method(method_name: str) -> tuple[str, str]:
+    """Split a "/package.Service/Method" path into (service, method) by slicing."""
+    first = method_name.find('/')
+    if first == -1:
+        return "unknown", method_name
+    second = method_name.find('/', first + 1)
+    service = method_name[first + 1:second] if second != -1 else method_name[first + 1:]
+    return service, method_name[method_name.rfind('/') + 1:]
+
 
 class TracingConfig:
     """Configuration for OpenTelemetry tracing."""
     
+    __slots__ = (
+        'service_name', 'service_version', 'otlp_endpoint', 'jaeger_endpoint',
+        'console_exporter', 'sample_rate', 'enable_grpc_instrumentation',
+        'enable_sqlalchemy_instrumentation', 'enable_asyncpg_instrumentation'
+    )
+    
     def __init__(
         self,
         service_name: str = "example-service-python",
@@ -120,6 +144,8 @@ class TracingInterceptor(grpc.aio.ServerInterceptor):
     
     def __init__(self, tracer_name: str = "grpc-server"):
         self.tracer = trace.get_tracer(tracer_name)
+        # Metadata keys read by the configured propagator (e.g. traceparent)
+        self.propagation_fields = frozenset(get_global_textmap().fields)
     
     async def intercept_service(
         self,
@@ -127,11 +153,48 @@ class TracingInterceptor(grpc.aio.ServerInterceptor):
         handler_call_details: grpc.HandlerCallDetails
     ) -> grpc.RpcMethodHandler:
         """Intercept gRPC service calls to add tracing spans."""
+        # Collect the propagation headers and span context in one pass over the
+        # metadata; later entries win, as they would in a dict
+        carrier = {}
+        correlation_id = None
+        user_id = None
+        propagation_fields = self.propagation_fields
+        for key, value in handler_call_details.invocation_metadata:
+            if key in propagation_fields:
+                carrier[key] = value
+            elif key == "x-correlation-id":
+                correlation_id = value
+            elif key == "x-user-id":
+                user_id = value
+        
+        return await self.trace_call(
+            continuation, handler_call_details, carrier, correlation_id, user_id
+        )
+    
+    async def trace_call(
+        self,
+        continuation: Callable,
+        handler_call_details: grpc.HandlerCallDetails,
+        carrier: Dict[str, str],
+        correlation_id: Optional[str],
+        user_id: Optional[str]
+    ) -> grpc.RpcMethodHandler:
+        """Run the rest of the call under a server span.
+        
+        Args:
+            continuation: The next interceptor or handler
+            handler_call_details: Details about the handler call
+            carrier: Incoming metadata entries for ``propagation_fields``
+            correlation_id: Correlation ID from metadata, if present
+            user_id: User ID from metadata, if present
+            
+        Returns:
+            The (possibly wrapped) method handler
+        """
         method_name = handler_call_details.method
         
         # Extract trace context from incoming metadata
-        metadata = dict(handler_call_details.invocation_metadata)
-        context = extract(metadata)
+        context = extract(carrier)
         
         # Create span for this gRPC call
         with self.tracer.start_as_current_span(
@@ -139,38 +202,29 @@ class TracingInterceptor(grpc.aio.ServerInterceptor):
             context=context,
             kind=trace.SpanKind.SERVER
         ) as span:
+            # Sampled-out spans record nothing, so skip attributes and handler wrapping
+            if not span.is_recording():
+                return await continuation(handler_call_details)
+            
             try:
                 # Add span attributes
-                span.set_attribute(SpanAttributes.RPC_SYSTEM, "grpc")
-                span.set_attribute(SpanAttributes.RPC_SERVICE, method_name.split('/')[1] if '/' in method_name else "unknown")
-                span.set_attribute(SpanAttributes.RPC_METHOD, method_name.split('/')[-1] if '/' in method_name else method_name)
-                span.set_attribute(SpanAttributes.RPC_GRPC_STATUS_CODE, grpc.StatusCode.OK.value[0])
+                service, method = _split_method(method_name)
+                span.set_attribute(_ATTR_RPC_SYSTEM, _RPC_SYSTEM_GRPC)
+                span.set_attribute(_ATTR_RPC_SERVICE, service)
+                span.set_attribute(_ATTR_RPC_METHOD, method)
+                span.set_attribute(_ATTR_RPC_STATUS, _OK_CODE)
                 
                 # Add correlation ID if present
-                correlation_id = metadata.get("x-correlation-id")
                 if correlation_id:
                     span.set_attribute("correlation.id", correlation_id)
                 
                 # Add user context if present
-                user_id = metadata.get("x-user-id")
                 if user_id:
                     span.set_attribute("user.id", user_id)
                 
-                # Inject trace context into outgoing metadata for downstream services
-                carrier = {}
-                inject(carrier)
-                enhanced_metadata = list(handler_call_details.invocation_metadata)
-                for key, value in carrier.items():
-                    enhanced_metadata.append((key, value))
-                
-                # Create enhanced handler call details
-                enhanced_handler_call_details = grpc.HandlerCallDetails(
-                    method=handler_call_details.method,
-                    invocation_metadata=enhanced_metadata
-                )
-                
-                # Continue with the request
-                handler = await continuation(enhanced_handler_call_details)
+                # Continue with the request; the span is current, so outbound
+                # propagation is left to client-side instrumentation
+                handler = await continuation(handler_call_details)
                 
                 # Wrap the handler to capture response information
                 if hasattr(handler, 'unary_unary'):
@@ -184,7 +238,7 @@ class TracingInterceptor(grpc.aio.ServerInterceptor):
                             span.set_status(Status(StatusCode.OK))
                             return response
                         except grpc.aio.AioRpcError as e:
-                            span.set_attribute(SpanAttributes.RPC_GRPC_STATUS_CODE, e.code().value[0])
+                            span.set_attribute(_ATTR_RPC_STATUS, e.code().value[0])
                             span.set_status(Status(StatusCode.ERROR, str(e)))
                             span.record_exception(e)
                             raise
@@ -205,9 +259,16 @@ class TracingInterceptor(grpc.aio.ServerInterceptor):
 
 
 class TracingContextManager:
-    """Context manager for custom tracing spans in business logic."""
+    """Context manager for custom tracing spans in business logic.
+    
+    Until an SDK tracer provider is installed (by ``setup_tracing`` or any other
+    means), ``start_span`` hands back the shared invalid span and the helpers
+    do nothing, as there is no recording span to act on.
+    """
     
     def __init__(self, tracer_name: str = "example-service"):
+        # A proxy tracer, so instances created at import time pick up the
+        # provider installed later
         self.tracer = trace.get_tracer(tracer_name)
     
     def start_span(
@@ -226,6 +287,10 @@ class TracingContextManager:
         Returns:
             Span context manager
         """
+        # Checked per call, so providers installed after import are honoured
+        if not isinstance(trace.get_tracer_provider(), TracerProvider):
+            return trace.INVALID_SPAN
+        
         span = self.tracer.start_span(name=name, kind=kind)
         
         if attributes:
@@ -241,19 +306,19 @@ class TracingContextManager:
     def add_event(self, name: str, attributes: Optional[Dict[str, Any]] = None) -> None:
         """Add an event to the current span."""
         span = trace.get_current_span()
-        if span:
+        if span.is_recording():
             span.add_event(name, attributes or {})
     
     def set_attribute(self, key: str, value: Any) -> None:
         """Set an attribute on the current span."""
         span = trace.get_current_span()
-        if span:
+        if span.is_recording():
             span.set_attribute(key, value)
     
     def record_exception(self, exception: Exception) -> None:
         """Record an exception on the current span."""
         span = trace.get_current_span()
-        if span:
+        if span.is_recording():
             span.record_exception(exception)
             span.set_status(Status(StatusCode.ERROR, str(exception)))
 
@@ -1,137 +1,481 @@
 """Database migration management for the Example Service."""
 
+from __future__ import annotations
+
 import asyncio
+import functools
+import hashlib
+import json
 import logging
 import os
-import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+from typing import TYPE_CHECKING, Callable
 
 import click
-from alembic import command, config
-from alembic.config import Config
+
+# Alembic (and SQLAlchemy behind it) is imported inside the functions that
+# use it, so `--help` and argument errors do not pay for loading it
+if TYPE_CHECKING:
+    from alembic.config import Config
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Find the alembic.ini file and migration scripts in the persistence module,
+# resolved once at import
+_ROOT_DIR = Path(__file__).resolve().parents[6]
+_PERSISTENCE_DIR = _ROOT_DIR / "{{ prefix-name }}-{{ suffix-name }}-persistence"
+_ALEMBIC_INI = _PERSISTENCE_DIR / "alembic.ini"
+# alembic.ini's script_location is relative to the working directory, which is
+# only right when running from the persistence module; anchor it instead
+_SCRIPT_LOCATION = str(_PERSISTENCE_DIR / "alembic").replace("%", "%%")
+
+# Written by env.py as revisions are applied; runs over several databases
+# write a summary here and each database's progress to its own file
+_MIGRATION_STATUS_FILE = os.getenv("MIGRATION_STATUS_FILE", "/tmp/migration_status.json")
+
+# Added to revisions created with --template data
+_DATA_MIGRATION_IMPORT = (
+    "from {{ org_name }}.{{ solution_name }}.{{ prefix_name }}.{{ suffix_name }}.persistence.migrations.helpers "
+    "import batched_update, create_index_concurrently\n"
+)
 
-def get_alembic_config(database_url: str | None = None) -> Config:
+
+@functools.lru_cache(maxsize=1)
+def _alembic_ini_path() -> str:
+    """Return the alembic.ini path, checking once per process that it exists."""
+    if not _ALEMBIC_INI.exists():
+        raise FileNotFoundError(f"alembic.ini not found at {_ALEMBIC_INI}")
+    return str(_ALEMBIC_INI)
+
+
+def get_alembic_config(
+    database_url: str | None = None,
+    timeouts: dict[str, str] | None = None,
+    status_file: str | None = None
+) -> Config:
     """Get Alembic configuration.
     
+    A new Config is built on each call, so options a caller sets on it do not
+    leak into later commands; only the alembic.ini lookup is cached.
+    
     Args:
         database_url: Optional database URL override
+        timeouts: Optional ``lock_timeout``/``statement_timeout`` values for env.py
+        status_file: Optional migration status file for env.py to write
         
     Returns:
         Configured Alembic Config object
     """
-    # Find the alembic.ini file in the persistence module
-    current_dir = Path(__file__).parent
-    root_dir = current_dir.parent.parent.parent.parent.parent.parent
-    alembic_ini_path = root_dir / "{{ prefix-name }}-{{ suffix-name }}-persistence" / "alembic.ini"
-    
-    if not alembic_ini_path.exists():
-        raise FileNotFoundError(f"alembic.ini not found at {alembic_ini_path}")
+    from alembic.config import Config
     
-    alembic_cfg = Config(str(alembic_ini_path))
+    alembic_cfg = Config(_alembic_ini_path())
+    alembic_cfg.set_main_option("script_location", _SCRIPT_LOCATION)
     
     # Override database URL if provided
     if database_url:
         alembic_cfg.set_main_option("sqlalchemy.url", database_url)
     
+    # Read by env.py in preference to the MIGRATION_*_TIMEOUT variables
+    if timeouts:
+        alembic_cfg.attributes["migration_timeouts"] = timeouts
+    if status_file:
+        alembic_cfg.attributes["migration_status_file"] = status_file
+    
     return alembic_cfg
 
 
-@click.group()
+async def _fetch_database_revisions(database_url: str) -> set[str]:
+    """Read the applied revisions straight from the alembic_version table."""
+    from sqlalchemy import inspect, pool, text
+    from sqlalchemy.ext.asyncio import create_async_engine
+    
+    engine = create_async_engine(database_url, poolclass=pool.NullPool)
+    try:
+        async with engine.connect() as connection:
+            has_version_table = await connection.run_sync(
+                lambda sync_connection: inspect(sync_connection).has_table("alembic_version")
+            )
+            if not has_version_table:
+                return set()
+            result = await connection.execute(text("SELECT version_num FROM alembic_version"))
+            return set(result.scalars())
+    finally:
+        await engine.dispose()
+
+
+def is_at_head(alembic_cfg: Config) -> bool:
+    """Check whether the database is already at the script head(s).
+    
+    Compares the alembic_version table with the migration scripts directly,
+    without loading env.py or taking the migration lock. Must be called from
+    synchronous code; from a running event loop, run it in a worker thread.
+    
+    Args:
+        alembic_cfg: Alembic configuration for the database
+        
+    Returns:
+        True if the database is at every head revision
+        
+    Raises:
+        RuntimeError: If called while an event loop is running
+    """
+    from alembic.script import ScriptDirectory
+    
+    # Check before creating the coroutine, so it is never left un-awaited
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        pass
+    else:
+        raise RuntimeError("is_at_head cannot be called from a running event loop")
+    
+    heads = set(ScriptDirectory.from_config(alembic_cfg).get_heads())
+    # Same URL precedence as env.py
+    database_url = os.getenv("DATABASE_URL") or alembic_cfg.get_main_option("sqlalchemy.url")
+    return asyncio.run(_fetch_database_revisions(database_url)) == heads
+
+
+def run_upgrade(
+    database_url: str | None = None,
+    force: bool = False,
+    timeouts: dict[str, str] | None = None,
+    status_file: str | None = None
+) -> None:
+    """Upgrade the database to the latest revision.
+    
+    env.py commits every revision in its own transaction, so revisions applied
+    before a failure are kept. Unless forced, a database already at head is
+    left alone without running env.py at all.
+    
+    Args:
+        database_url: Optional database URL override
+        force: Run the upgrade even if the database appears to be at head
+        timeouts: Optional ``lock_timeout``/``statement_timeout`` values for env.py
+        status_file: Optional migration status file for env.py to write
+    """
+    from alembic import command
+    
+    alembic_cfg = get_alembic_config(database_url, timeouts, status_file)
+    
+    if not force:
+        try:
+            if is_at_head(alembic_cfg):
+                logger.info("Database is already at head, nothing to upgrade")
+                return
+        except Exception as e:
+            # Let the regular upgrade run and report any real problem
+            logger.warning("Head check failed, running upgrade: %s", e)
+    
+    command.upgrade(alembic_cfg, "head")
+
+
+def _upgrade_target(database_url: str, force: bool, timeouts: dict[str, str] | None) -> None:
+    """Upgrade one database in a worker process.
+    
+    env.py prefers DATABASE_URL over the configured URL, so the worker points
+    it at its target before upgrading. Progress goes to the target's own
+    status file, so parallel workers do not overwrite each other's.
+    """
+    os.environ["DATABASE_URL"] = database_url
+    run_upgrade(
+        database_url,
+        force=force,
+        timeouts=timeouts,
+        status_file=_target_status_file(database_url)
+    )
+
+
+def _target_status_file(database_url: str) -> str:
+    """Status file for one database of a multi-database run, keyed by a URL hash."""
+    base, ext = os.path.splitext(_MIGRATION_STATUS_FILE)
+    digest = hashlib.sha256(database_url.encode("utf-8")).hexdigest()[:16]
+    return f"{base}.{digest}{ext}"
+
+
+def _write_status(path: str, status: dict) -> None:
+    """Replace a status file through a temporary file, so readers never see a partial write."""
+    tmp_path = None
+    try:
+        with tempfile.NamedTemporaryFile(
+            "w", dir=os.path.dirname(os.path.abspath(path)), suffix=".tmp",
+            delete=False, encoding="utf-8"
+        ) as status_file:
+            tmp_path = status_file.name
+            json.dump(status, status_file)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.warning("Could not write migration status to %s: %s", path, e)
+        if tmp_path is not None:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+
+
+def _redact_url(database_url: str) -> str:
+    """Render a database URL for logging with its password hidden."""
+    from sqlalchemy.engine import make_url
+    
+    try:
+        return make_url(database_url).render_as_string(hide_password=True)
+    except Exception:
+        return "<invalid database url>"
+
+
+def upgrade_many(
+    database_urls: list[str],
+    jobs: int = 6,
+    batch_size: int = 50,
+    force: bool = False,
+    timeouts: dict[str, str] | None = None
+) -> list[str]:
+    """Upgrade several databases (e.g. one per tenant) in parallel.
+    
+    Each database is upgraded in its own worker process, because Alembic's
+    migration context is process-global. Targets are submitted ``batch_size``
+    at a time, and targets that fail are retried once after all batches ran.
+    Targets already at head are skipped unless ``force`` is set. Each target
+    records its progress in its own status file; the shared status file gets a
+    summary of the whole run once it finishes.
+    
+    Args:
+        database_urls: Database URLs to upgrade
+        jobs: Number of worker processes
+        batch_size: Number of targets submitted to the pool at a time
+        force: Upgrade targets even if they appear to be at head
+        timeouts: Optional ``lock_timeout``/``statement_timeout`` values for env.py
+        
+    Returns:
+        Database URLs that still failed after the retry
+    """
+    def run_batches(executor: ProcessPoolExecutor, urls: list[str]) -> list[str]:
+        failed = []
+        for start in range(0, len(urls), batch_size):
+            batch = urls[start:start + batch_size]
+            futures = [(url, executor.submit(_upgrade_target, url, force, timeouts)) for url in batch]
+            for url, future in futures:
+                try:
+                    future.result()
+                    logger.info("Upgraded %s", _redact_url(url))
+                except Exception as e:
+                    logger.warning("Upgrade of %s failed: %s", _redact_url(url), e)
+                    failed.append(url)
+        return failed
+    
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        failed = run_batches(executor, database_urls)
+        if failed:
+            logger.info("Retrying %d failed database upgrade(s)", len(failed))
+            failed = run_batches(executor, failed)
+    
+    _write_status(_MIGRATION_STATUS_FILE, {
+        "state": "failed" if failed else "completed",
+        "databases": len(database_urls),
+        "failed": [
+            {"target": _redact_url(url), "status_file": _target_status_file(url)}
+            for url in failed
+        ],
+        "ts": time.time(),
+    })
+    return failed
+
+
+def _read_database_urls(path: str) -> list[str]:
+    """Read one database URL per line, skipping blank lines and # comments."""
+    with open(path, encoding="utf-8") as urls_file:
+        return [
+            line.strip() for line in urls_file
+            if line.strip() and not line.lstrip().startswith("#")
+        ]
+
+
+def _add_data_migration_import(script_path: str) -> None:
+    """Import the batched data migration helpers in a generated revision."""
+    path = Path(script_path)
+    source = path.read_text(encoding="utf-8")
+    anchor = "from alembic import op\n"
+    if anchor in source:
+        source = source.replace(anchor, anchor + _DATA_MIGRATION_IMPORT, 1)
+    else:
+        source = _DATA_MIGRATION_IMPORT + source
+    path.write_text(source, encoding="utf-8")
+
+
+# Shared by every command that talks to the database
+database_url_option = click.option(
+    "--database-url",
+    "-d",
+    envvar="DATABASE_URL",
+    help="Database URL (can also be set via DATABASE_URL env var)"
+)
+
+
+def timeout_options(func: Callable) -> Callable:
+    """Add --lock-timeout and --statement-timeout, passed to env.py via the Alembic config."""
+    func = click.option(
+        "--statement-timeout",
+        default="0",
+        envvar="MIGRATION_STATEMENT_TIMEOUT",
+        show_default=True,
+        help="PostgreSQL statement_timeout for migrations, '0' (no limit) suits long index builds"
+    )(func)
+    return click.option(
+        "--lock-timeout",
+        default="5s",
+        envvar="MIGRATION_LOCK_TIMEOUT",
+        show_default=True,
+        help="PostgreSQL lock_timeout for migrations, '0' to disable"
+    )(func)
+
+
+class MigrationGroup(click.Group):
+    """Click group that logs a failing command's error and exits with status 1."""
+
+    def invoke(self, ctx: click.Context) -> object:
+        """Invoke the selected command, turning unexpected errors into exit code 1."""
+        try:
+            return super().invoke(ctx)
+        except (click.ClickException, click.exceptions.Exit, click.Abort):
+            raise
+        except Exception as e:
+            logger.error("%s failed: %s", ctx.invoked_subcommand, e)
+            ctx.exit(1)
+
+
+@click.group(cls=MigrationGroup)
 def cli() -> None:
     """Database migration management commands."""
     pass
 
 
 @cli.command()
+@database_url_option
+@timeout_options
 @click.option(
-    "--database-url",
-    "-d",
-    envvar="DATABASE_URL",
-    help="Database URL (can also be set via DATABASE_URL env var)"
+    "--mode",
+    type=click.Choice(["sync", "skip"]),
+    default="sync",
+    envvar="MIGRATION_MODE",
+    show_default=True,
+    help="Run migrations now, or skip them (can also be set via MIGRATION_MODE env var)"
+)
+@click.option(
+    "--database-urls-file",
+    type=click.Path(exists=True, dir_okay=False),
+    help="File with one database URL per line (e.g. one per tenant) to upgrade in parallel"
+)
+@click.option(
+    "--jobs",
+    "-j",
+    type=click.IntRange(min=1),
+    default=6,
+    show_default=True,
+    help="Worker processes used with --database-urls-file"
+)
+@click.option(
+    "--batch-size",
+    type=click.IntRange(min=1),
+    default=50,
+    show_default=True,
+    help="Databases submitted to the workers at a time with --database-urls-file"
+)
+@click.option(
+    "--force",
+    is_flag=True,
+    default=False,
+    help="Run the upgrade even if the database is already at head"
 )
-def upgrade(database_url: str | None = None) -> None:
+def upgrade(
+    database_url: str | None = None,
+    lock_timeout: str = "5s",
+    statement_timeout: str = "0",
+    mode: str = "sync",
+    database_urls_file: str | None = None,
+    jobs: int = 6,
+    batch_size: int = 50,
+    force: bool = False
+) -> None:
     """Run database migrations to upgrade to the latest version."""
-    try:
-        logger.info("Starting database migration upgrade...")
-        alembic_cfg = get_alembic_config(database_url)
-        command.upgrade(alembic_cfg, "head")
+    if mode == "skip":
+        logger.info("Skipping database migration upgrade (mode=skip)")
+        return
+    
+    timeouts = {"lock_timeout": lock_timeout, "statement_timeout": statement_timeout}
+    
+    if database_urls_file:
+        database_urls = _read_database_urls(database_urls_file)
+        logger.info(
+            "Starting database migration upgrade of %d databases with %d workers...",
+            len(database_urls),
+            jobs
+        )
+        failed = upgrade_many(
+            database_urls, jobs=jobs, batch_size=batch_size, force=force, timeouts=timeouts
+        )
+        if failed:
+            raise RuntimeError(f"{len(failed)} of {len(database_urls)} databases failed to upgrade")
         logger.info("Database migration upgrade completed successfully")
-    except Exception as e:
-        logger.error(f"Database migration upgrade failed: {e}")
-        sys.exit(1)
+        return
+    
+    logger.info("Starting database migration upgrade...")
+    run_upgrade(database_url, force=force, timeouts=timeouts)
+    logger.info("Database migration upgrade completed successfully")
 
 
 @cli.command()
-@click.option(
-    "--database-url",
-    "-d",
-    envvar="DATABASE_URL",
-    help="Database URL (can also be set via DATABASE_URL env var)"
-)
+@database_url_option
+@timeout_options
 @click.option(
     "--revision",
     "-r",
     default="-1",
     help="Target revision for downgrade (default: -1 for one step back)"
 )
-def downgrade(database_url: str | None = None, revision: str = "-1") -> None:
+def downgrade(
+    database_url: str | None = None,
+    lock_timeout: str = "5s",
+    statement_timeout: str = "0",
+    revision: str = "-1"
+) -> None:
     """Downgrade database to a previous migration."""
-    try:
-        logger.info(f"Starting database migration downgrade to revision: {revision}")
-        alembic_cfg = get_alembic_config(database_url)
-        command.downgrade(alembic_cfg, revision)
-        logger.info("Database migration downgrade completed successfully")
-    except Exception as e:
-        logger.error(f"Database migration downgrade failed: {e}")
-        sys.exit(1)
+    from alembic import command
+    
+    logger.info("Starting database migration downgrade to revision: %s", revision)
+    alembic_cfg = get_alembic_config(
+        database_url,
+        {"lock_timeout": lock_timeout, "statement_timeout": statement_timeout}
+    )
+    command.downgrade(alembic_cfg, revision)
+    logger.info("Database migration downgrade completed successfully")
 
 
 @cli.command()
-@click.option(
-    "--database-url",
-    "-d",
-    envvar="DATABASE_URL",
-    help="Database URL (can also be set via DATABASE_URL env var)"
-)
+@database_url_option
 def current(database_url: str | None = None) -> None:
     """Show current database revision."""
-    try:
-        alembic_cfg = get_alembic_config(database_url)
-        command.current(alembic_cfg)
-    except Exception as e:
-        logger.error(f"Failed to get current revision: {e}")
-        sys.exit(1)
+    from alembic import command
+    
+    alembic_cfg = get_alembic_config(database_url)
+    command.current(alembic_cfg)
 
 
 @cli.command()
-@click.option(
-    "--database-url",
-    "-d",
-    envvar="DATABASE_URL",
-    help="Database URL (can also be set via DATABASE_URL env var)"
-)
+@database_url_option
 def history(database_url: str | None = None) -> None:
     """Show migration history."""
-    try:
-        alembic_cfg = get_alembic_config(database_url)
-        command.history(alembic_cfg)
-    except Exception as e:
-        logger.error(f"Failed to get migration history: {e}")
-        sys.exit(1)
+    from alembic import command
+    
+    alembic_cfg = get_alembic_config(database_url)
+    command.history(alembic_cfg)
 
 
 @cli.command()
-@click.option(
-    "--database-url",
-    "-d",
-    envvar="DATABASE_URL",
-    help="Database URL (can also be set via DATABASE_URL env var)"
-)
+@database_url_option
 @click.option(
     "--message",
     "-m",
@@ -143,39 +487,66 @@ def history(database_url: str | None = None) -> None:
     default=True,
     help="Use autogenerate to detect schema changes"
 )
+@click.option(
+    "--template",
+    type=click.Choice(["schema", "data"]),
+    default="schema",
+    show_default=True,
+    help="Scaffold a schema migration, or a data migration importing the batched update helpers"
+)
 def revision(
     database_url: str | None = None,
     message: str = "",
-    autogenerate: bool = True
+    autogenerate: bool = True,
+    template: str = "schema"
 ) -> None:
     """Create a new migration revision."""
-    try:
-        logger.info(f"Creating new migration: {message}")
-        alembic_cfg = get_alembic_config(database_url)
-        command.revision(alembic_cfg, message=message, autogenerate=autogenerate)
-        logger.info("Migration revision created successfully")
-    except Exception as e:
-        logger.error(f"Failed to create migration revision: {e}")
-        sys.exit(1)
+    from alembic import command
+    
+    logger.info("Creating new migration: %s", message)
+    alembic_cfg = get_alembic_config(database_url)
+    # Data migrations are written by hand; there is no schema diff to generate
+    if template == "data":
+        autogenerate = False
+    script = command.revision(alembic_cfg, message=message, autogenerate=autogenerate)
+    if template == "data" and script is not None:
+        scripts = script if isinstance(script, list) else [script]
+        for generated in scripts:
+            if generated is not None:
+                _add_data_migration_import(generated.path)
+    logger.info("Migration revision created successfully")
+
+
+@cli.command()
+@database_url_option
+def stamp(database_url: str | None = None) -> None:
+    """Stamp the database with the current head revision."""
+    from alembic import command
+    
+    logger.info("Stamping database with head revision...")
+    alembic_cfg = get_alembic_config(database_url)
+    command.stamp(alembic_cfg, "head")
+    logger.info("Database stamped successfully")
 
 
 @cli.command()
 @click.option(
     "--database-url",
     "-d",
-    envvar="DATABASE_URL",
-    help="Database URL (can also be set via DATABASE_URL env var)"
+    help="Show one database's progress from a --database-urls-file run"
 )
-def stamp(database_url: str | None = None) -> None:
-    """Stamp the database with the current head revision."""
+def status(database_url: str | None = None) -> None:
+    """Show progress of the last migration run in this container."""
+    path = _target_status_file(database_url) if database_url else _MIGRATION_STATUS_FILE
     try:
-        logger.info("Stamping database with head revision...")
-        alembic_cfg = get_alembic_config(database_url)
-        command.stamp(alembic_cfg, "head")
-        logger.info("Database stamped successfully")
-    except Exception as e:
-        logger.error(f"Failed to stamp database: {e}")
-        sys.exit(1)
+        with open(path, encoding="utf-8") as status_file:
+            migration_status = json.load(status_file)
+    except FileNotFoundError:
+        raise click.ClickException(f"No migration status recorded at {path}")
+    
+    click.echo(json.dumps(migration_status, indent=2))
+    if migration_status.get("state") == "failed":
+        raise click.exceptions.Exit(1)
 
 
 def main() -> None: